@@ -0,0 +1,335 @@
+"""
+Script que contém o template das fichas de itens (armas, armaduras, escudos, consumíveis):
+a ficha inteira vira um único bloco HTML, enviado ao navegador com um só `st.markdown`.
+As fichas com tiers são fragmentos isolados: trocar o tier reexecuta só a própria ficha.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import re
+from html import escape
+import pandas as pd
+import streamlit as st
+
+# RELATIVE IMPORTS
+from app.utils import TIER_COLORS, TIER_ORDER
+from app.src.tier_index import get_tier_groups
+from app.components.filters import diff_text_granular
+from app.components.lazy_expander import lazy_expander
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+# Markdown das células: blocos (por linha) e marcações dentro da linha
+_HEADING_RE = re.compile(r"#{1,6}\s+(.*)")
+_BULLET_RE = re.compile(r"[-*+]\s+(.*)")
+_ORDERED_RE = re.compile(r"\d+[.)]\s+(.*)")
+_TAG_RE = re.compile(r"<[^>]*>")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\((https?://[^\s()\"'<>]+)\)")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_ITALIC_RE = re.compile(
+    r"(?<![*\w])\*(?![\s*])(.+?)(?<![\s*])\*(?![*\w])"
+    r"|(?<![_\w])_(?![\s_])(.+?)(?<![\s_])_(?![_\w])"
+)
+_HELD_RE = re.compile(r"\x00(\d+)\x00")
+
+# Estilos inline (o bloco não depende de CSS injetado na página)
+_CARD_STYLE = "display:flex; flex-direction:column; gap:0.75rem; margin-bottom:0.5rem"
+_GRID_STYLE = "display:grid; grid-template-columns:repeat({columns}, minmax(0, 1fr)); gap:0.5rem 1rem"
+_LIST_STYLE = "margin:0.25rem 0 0 0; padding-left:1.25rem"
+_PARAGRAPH_STYLE = "margin:0.25rem 0 0 0"
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def _inline_html(line: str) -> str:
+    """
+    Links, **negrito** e *itálico* de uma linha. As tags já presentes (glossário, destaques de
+    tier) e os links gerados ficam guardados durante a troca: o markdown nunca mexe nos seus
+    atributos (ex.: `_` ou `*` no `title` de um termo do glossário).
+    """
+    held = []
+
+    def hold(tag: str) -> str:
+        held.append(tag)
+        return f"\x00{len(held) - 1}\x00"
+
+    line = _TAG_RE.sub(lambda m: hold(m.group(0)), line)
+    line = _LINK_RE.sub(
+        lambda m: hold(f'<a href="{m.group(2)}" target="_blank">') + m.group(1) + hold("</a>"), line
+    )
+    line = _BOLD_RE.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", line)
+    line = _ITALIC_RE.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", line)
+
+    return _HELD_RE.sub(lambda m: held[int(m.group(1))], line)
+
+def text_html(text) -> str:
+    """
+    Converte o texto de uma célula (markdown das planilhas, podendo conter spans de
+    destaque/glossário) em HTML, como o `st.markdown` faria: itens "- "/"* " e "1. "
+    consecutivos viram listas, títulos "#" viram uma linha em negrito e as demais linhas,
+    parágrafos; dentro da linha, links `[texto](http...)`, **negrito** e *itálico*.
+    """
+    parts, items = [], []
+    list_tag = "ul"
+
+    def close_list():
+        if items:
+            parts.append(
+                f"<{list_tag} style='{_LIST_STYLE}'>"
+                + "".join(f"<li>{i}</li>" for i in items)
+                + f"</{list_tag}>"
+            )
+            items.clear()
+
+    for line in str(text).splitlines():
+        line = line.strip()
+
+        if not line:
+            close_list()
+            continue
+
+        heading = _HEADING_RE.fullmatch(line)
+        item = _BULLET_RE.fullmatch(line) or _ORDERED_RE.fullmatch(line)
+
+        if item:
+            tag = "ul" if item.re is _BULLET_RE else "ol"
+
+            if tag != list_tag:
+                close_list()
+                list_tag = tag
+
+            items.append(_inline_html(item.group(1)))
+            continue
+
+        close_list()
+
+        if heading:
+            parts.append(f"<p style='{_PARAGRAPH_STYLE}'><strong>{_inline_html(heading.group(1))}</strong></p>")
+        else:
+            parts.append(f"<p style='{_PARAGRAPH_STYLE}'>{_inline_html(line)}</p>")
+
+    close_list()
+
+    return "".join(parts)
+
+def _field_html(label: str, value) -> str:
+    """ Célula "**Rótulo:** valor" da grade (valor None = célula vazia). """
+    if value is None:
+        return "<div></div>"
+
+    return f"<div><strong>{label}:</strong> {value}</div>"
+
+def _section_html(label: str, text) -> str:
+    """ Bloco de texto longo (descrição, observação) com o rótulo acima. """
+    return f"<div><strong>{label}:</strong>{text_html(text)}</div>"
+
+def _grid_html(cells: list, columns: int) -> str:
+    return f"<div style='{_GRID_STYLE.format(columns=columns)}'>" + "".join(cells) + "</div>"
+
+def card_html(header: list, fields: list, sections: list = (), columns: int = 2, section_columns: int = 1) -> str:
+    """
+    Monta o HTML de uma ficha:
+
+    - header: [(rótulo, valor)] na primeira linha da grade (ex.: Tier, Perícia);
+    - fields: [(rótulo, valor)] distribuídos em `columns` colunas, na ordem (linha a linha);
+    - sections: [(rótulo, texto)] de texto longo, em `section_columns` colunas.
+
+    Os valores já podem conter HTML (destaques do tier, glossário); valores None deixam a
+    célula vazia, mantendo o alinhamento da grade.
+    """
+    blocks = [_grid_html([_field_html(label, value) for label, value in header], columns)]
+
+    if fields:
+        blocks.append(_grid_html([_field_html(label, value) for label, value in fields], columns))
+
+    if sections:
+        blocks.append(_grid_html([_section_html(label, text) for label, text in sections], section_columns))
+
+    return f"<div style='{_CARD_STYLE}'>" + "".join(blocks) + "</div>"
+
+def render_card(header: list, fields: list, sections: list = (), columns: int = 2, section_columns: int = 1) -> None:
+    """ Renderiza a ficha (`card_html`) com uma única chamada ao `st.markdown`. """
+    st.markdown(card_html(header, fields, sections, columns, section_columns), unsafe_allow_html=True)
+
+def tier_badge(label: str, color: str) -> str:
+    """ Nome do tier na cor dele (valor do cabeçalho das fichas). """
+    return f"<span style='color:{color}; font-weight:700'>{label}</span>"
+
+# ------------------------------------------------------------------------------------------------ #
+# FICHAS COM TIERS
+
+def add_tier_levels(df: pd.DataFrame, tier_column: str, tier_map: dict) -> pd.DataFrame:
+    """ Adiciona `tier_level` (nível numérico do tier, categórico ordenado) a partir do nome. """
+    name_to_level = {v: k for k, v in tier_map.items()}
+
+    df["tier_level"] = (
+        df[tier_column]
+        .astype(str)
+        .str.strip()
+        .map(name_to_level)
+    )
+
+    df["tier_level"] = pd.Categorical(
+        df["tier_level"],
+        categories=TIER_ORDER,
+        ordered=True
+    )
+
+    return df
+
+def tier_highlighter(row: pd.Series, prev_row: pd.Series, tier_color: str, glossary_html: dict = None):
+    """
+    Retorna `h(campo)`: o valor formatado do campo, com o que mudou em relação ao tier
+    anterior destacado na cor do tier. Sem tier anterior, textos com glossário
+    (`glossary_html` = {campo: HTML por rótulo}) usam o HTML já marcado (e escapado); os
+    demais textos são escapados aqui, já que a ficha vira um bloco HTML.
+    """
+    glossary_html = glossary_html or {}
+
+    def h(field):
+
+        if prev_row is None:
+            value = row[field]
+
+            # sem diff de tier: usa o texto já marcado com o glossário
+            if isinstance(value, str) and field in glossary_html:
+                return glossary_html[field].get(row.name) or escape(value, quote=False)
+
+            if isinstance(value, (int, float)):
+                return f"{float(value):.1f}"
+
+            return escape(str(value), quote=False)
+
+        value = row[field]
+        prev = prev_row[field]
+
+        # textos longos → diff granular
+        if isinstance(value, str):
+            return diff_text_granular(escape(value, quote=False), escape(str(prev), quote=False), tier_color)
+
+        # números → round + highlight
+        if isinstance(value, (int, float)):
+            value_fmt = f"{float(value):.1f}"
+            prev_fmt = f"{float(prev):.1f}" if isinstance(prev, (int, float)) else prev
+
+            if value_fmt != prev_fmt:
+                return f"<span style='color:{tier_color}; font-weight:600'>{value_fmt}</span>"
+
+            return value_fmt
+
+        # fallback
+        if value != prev:
+            return f"<span style='color:{tier_color}; font-weight:600'>{escape(str(value), quote=False)}</span>"
+
+        return escape(str(value), quote=False)
+
+    return h
+
+@st.fragment
+def tiered_card(tier_rows: dict, item_name: str, tier_map: dict, build_card, glossary_html: dict = None):
+    """
+    Ficha de um item com seletor de tier. É um `st.fragment`: clicar em um tier reexecuta
+    apenas esta função (com os mesmos argumentos), sem reler a planilha nem redesenhar as
+    demais fichas da página.
+
+    `tier_rows` são as linhas do item por nível do tier ({nível: linha}); `build_card(h, tier)`
+    recebe o destacador de campos (`tier_highlighter`) e o nome do tier já colorido, e
+    retorna os argumentos de `render_card` (header, fields, sections...).
+    """
+    name_to_level = {v: k for k, v in tier_map.items()}
+
+    tiers_available = sorted(tier_rows)
+
+    if not tiers_available:
+        st.warning("Sem tiers disponíveis")
+        return
+
+    tier_labels = [tier_map[t] for t in tiers_available]
+
+    default_level = 1 if 1 in tiers_available else tiers_available[0]
+    default_label = tier_map[default_level]
+
+    # -----------------------------
+    # seleção de tier
+    # -----------------------------
+    try:
+        selected_label = st.segmented_control(
+            "Tier",
+            options=tier_labels,
+            default=default_label,
+            key=f"tier_segment_{item_name}"
+        )
+    except Exception:
+        selected_label = st.radio(
+            "Tier",
+            options=tier_labels,
+            index=tier_labels.index(default_label),
+            horizontal=True,
+            key=f"tier_radio_{item_name}"
+        )
+
+    selected_level = name_to_level[selected_label]
+
+    # -----------------------------
+    # linha atual e tier anterior
+    # -----------------------------
+    row = tier_rows[selected_level]
+
+    prev_row = None
+    idx = tiers_available.index(selected_level)
+
+    if idx > 0:
+        prev_row = tier_rows[tiers_available[idx - 1]]
+
+    tier_color = TIER_COLORS.get(selected_level, "#374151")
+
+    h = tier_highlighter(row, prev_row, tier_color, glossary_html)
+    render_card(**build_card(h, tier_badge(tier_map[selected_level], tier_color)))
+
+def item_tier_rows(df: pd.DataFrame, item_positions: dict) -> dict:
+    """ {nível: linha} de um item a partir das posições em `df` (`TierGroups.item_positions`). """
+    return {level: df.iloc[position] for level, position in item_positions.items()}
+
+def render_tiered_cards(
+    df: pd.DataFrame,
+    name_column: str,
+    id_column: str,
+    tier_column: str,
+    tier_map: dict,
+    build_card,
+    glossary_html: dict = None,
+) -> None:
+    """
+    Renderiza um expander por item (em ordem do menor id), cada um com a sua ficha com
+    tiers (`tiered_card`).
+
+    As linhas de cada item por tier vêm do agrupamento da aba em cache (`get_tier_groups`,
+    um `groupby` por versão dos dados): cada ficha é montada com buscas O(1), sem filtrar a
+    tabela inteira por item.
+
+    Os expanders são preguiçosos (`lazy_expander`): a ficha só é montada para os itens
+    abertos.
+    """
+    order = (
+        df.groupby(name_column)[id_column]
+        .min()
+        .sort_values()
+        .index
+    )
+
+    groups = get_tier_groups(df, name_column, tier_column, tier_map)
+    frame_positions = groups.frame_positions(df)
+
+    for item_name in order:
+
+        body = lazy_expander(item_name, key=f"{name_column}::{item_name}")
+
+        if body is None:
+            continue
+
+        tier_rows = item_tier_rows(df, groups.item_positions(item_name, frame_positions))
+
+        with body:
+            tiered_card(tier_rows, item_name, tier_map, build_card, glossary_html)
@@ -6,16 +6,36 @@ Script que contém os componentes de filtragem das páginas do projeto.
 # IMPORT
 
 import os
-import re
-import unicodedata
+import warnings
 from difflib import SequenceMatcher
+import numpy as np
 import streamlit as st
 import pandas as pd
 import streamlit as st
 
+# RELATIVE IMPORTS
+from app.src.data_loader import get_frame_key
+from app.src.text_processing import normalize_text, tokenize
+from app.src.filter_index import (
+    get_filter_bitmaps, rows_bitset, bitset_to_mask, positions_to_bitset, selected_rows, facet_counts
+)
+from app.src.fulltext_index import get_field_index, get_fulltext_index
+from app.src.search_index import get_name_index, get_prefix_index, get_symspell_index
+from app.src.search_cache import SearchResultCache, format_stats, search_result_cache
+from app.src.sort_index import sort_frame
+from app.src.query_planner import Query, QueryPlan, format_report, rows_digest, labels_digest
+
 # ------------------------------------------------------------------------------------------------ #
 # CONSTANTES
 
+# Modos dos filtros de tags (rótulo na interface → modo do TagIndex)
+TAG_FILTER_MODES = {"Qualquer uma": "any", "Todas": "all"}
+
+# Resultados de filtros/consultas guardados por sessão (as execuções da página disparadas por
+# widgets que não filtram, como o modo de visualização, reaproveitam o último resultado)
+SESSION_CACHE_KEY = "_query_cache"
+SESSION_CACHE_ENTRIES = 32
+
 utils_directory = os.path.dirname(os.path.dirname(__file__)).rstrip('.')
 
 # ------------------------------------------------------------------------------------------------ #
@@ -62,12 +82,61 @@ def get_project_folder(folder_name: str = None) -> str:
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES UTILITÁRIAS PARA O STREAMLIT
 
-def dynamic_filters(df: pd.DataFrame, filter_config: dict):
+def session_query_cache() -> SearchResultCache:
+    """
+    Cache LRU (limitado a `SESSION_CACHE_ENTRIES`) dos resultados de filtros e consultas da
+    sessão atual. As chaves começam por (arquivo, aba, versão): uma nova versão dos dados
+    descarta as entradas antigas da aba.
+    """
+    if SESSION_CACHE_KEY not in st.session_state:
+        st.session_state[SESSION_CACHE_KEY] = SearchResultCache(SESSION_CACHE_ENTRIES)
+
+    return st.session_state[SESSION_CACHE_KEY]
+
+def _freeze_selection(selection):
+    """ Forma imutável (usável em chave de cache) de uma seleção de filtro. """
+    if isinstance(selection, (list, tuple)):
+        return tuple(_freeze_selection(v) for v in selection)
+
+    return selection
+
+def _filter_key(df: pd.DataFrame, filter_label: str, col_name: str) -> str:
+    """ Chave de sessão do widget de um filtro (por aba, quando ela é conhecida). """
+    frame_key = get_frame_key(df)
+
+    if frame_key:
+        return f"_filter::{frame_key[0]}::{frame_key[1]}::{col_name}"
+
+    return f"_filter::{filter_label}::{col_name}"
+
+def dynamic_filters(df: pd.DataFrame, filter_config: dict, query: Query = None):
     """
     Aplica filtros dinâmicos em um DataFrame usando componentes do Streamlit.
     Toda vez que um filtro é aplicado, os demais se ajustam de acordo com os
     valores restantes no subconjunto filtrado.
 
+    As opções de cada filtro mostram quantas linhas restariam ao escolhê-las, ex.:
+    "Avançado (14)", considerando as seleções dos demais filtros. As seleções são lidas da
+    sessão antes de desenhar os widgets, e todas as contagens saem de uma única passada sobre
+    os bitmaps da aba (`facet_counts`); o DataFrame filtrado é materializado uma única vez,
+    no final.
+
+    Filtros do tipo "range" viram um slider [mín, máx] sobre uma coluna numérica (valores não
+    numéricos ficam de fora quando o intervalo é restringido), respondido pelo índice
+    pré-ordenado da coluna (`NumericColumnIndex`).
+
+    Filtros do tipo "tags" são para colunas com listas separadas por vírgula (ex.: tipos de
+    dano, requisitos): cada tag vira uma opção e a linha passa se tiver qualquer uma ou todas
+    as tags escolhidas (`TagIndex`).
+
+    Com `query`, as seleções são apenas registradas na consulta (facetas e intervalos) e `df`
+    volta sem filtrar; as contagens já consideram a busca registrada antes na mesma consulta.
+    A filtragem acontece em `run_query`.
+
+    Contagens e linhas selecionadas ficam no cache da sessão (`session_query_cache`), pela
+    chave (aba, versão, universo, seleções): execuções da página disparadas por outros widgets
+    não refazem a filtragem.
+
     Args:
         df : pd.DataFrame
             DataFrame original contendo os dados a serem filtrados.
@@ -77,31 +146,150 @@ def dynamic_filters(df: pd.DataFrame, filter_config: dict):
             {
                 "label_para_ui": {
                     "column": "nome_da_coluna",
-                    "type": "multiselect" | "selectbox",
+                    "type": "multiselect" | "selectbox" | "range" | "tags",
                     "default": []
                     "sort_order": []
                 },
                 ...
             }
 
+        query : Query
+            Consulta a preencher (opcional).
+
     Return:
         filtered_df : pd.DataFrame
             DataFrame após aplicação de todos os filtros.
 
         filter_state : dict
-            Dicionário contendo os valores selecionados para cada filtro.
+            Dicionário contendo os valores selecionados para cada filtro
+            ((mín, máx) nos filtros de intervalo, {"mode", "values"} nos de tags).
     """
 
-    filtered_df = df.copy()
     filter_state = {}
 
-    # Itera sobre filtros na ordem definida
+    if not filter_config:
+        return df, filter_state
+
+    for cfg in filter_config.values():
+        if cfg.get("type", "multiselect") not in ("multiselect", "selectbox", "range", "tags"):
+            raise ValueError(f"Unsupported filter type: {cfg.get('type')}")
+
+    indexes = get_filter_bitmaps(
+        df,
+        [cfg["column"] for cfg in filter_config.values()],
+        range_columns=[cfg["column"] for cfg in filter_config.values() if cfg.get("type") == "range"],
+        tag_columns=[cfg["column"] for cfg in filter_config.values() if cfg.get("type") == "tags"],
+    )
+
+    # Universo: as linhas de `df` dentro do índice da aba
+    any_index = next(iter(indexes.values()))
+    positions, universe_bitset = rows_bitset(any_index, df)
+    universe = bitset_to_mask(universe_bitset, any_index.n_rows)
+
+    # Com uma consulta, o universo das contagens já exclui o que a busca descartou
+    if query is not None:
+        searched = QueryPlan(query).execute(
+            kinds=("search", "text"), materialize=False, cache=session_query_cache()
+        )["mask"]
+        universe &= searched
+        universe_bitset = positions_to_bitset(np.flatnonzero(universe), any_index.n_rows)
+
+    # Seleções atuais (da sessão), descartando valores que não existem mais no universo
+    keys, selections, limits, modes, active = {}, {}, {}, {}, []
+
     for filter_label, cfg in filter_config.items():
         col_name = cfg["column"]
         filter_type = cfg.get("type", "multiselect")
-        default = cfg.get("default", [])
+        index = indexes[col_name]
+        key = _filter_key(df, filter_label, col_name)
+
+        if filter_type == "range":
+            # a chave inclui os limites: um universo com outra faixa começa sem filtro
+            limits[filter_label] = index.bounds(universe)
+            low_high = limits[filter_label]
+
+            if low_high is None or low_high[0] == low_high[1]:
+                selection = None
+            else:
+                key = f"{key}::{low_high[0]}::{low_high[1]}"
+                low, high = st.session_state.get(key, low_high)
+                selection = (max(low, low_high[0]), min(high, low_high[1]))
+
+            active.append(selection if selection not in (None, low_high) else ())
+
+        elif filter_type == "multiselect":
+            present = set(index.present_values(universe_bitset))
+            selection = st.session_state.get(key, cfg.get("default", []))
+            selection = [v for v in selection if v in present]
+            active.append(selection)
+
+        elif filter_type == "tags":
+            present = set(index.present_values(universe_bitset))
+            selection = st.session_state.get(key, cfg.get("default", []))
+            selection = [v for v in selection if v in present]
+            modes[filter_label] = TAG_FILTER_MODES[
+                st.session_state.get(f"{key}::mode", next(iter(TAG_FILTER_MODES)))
+            ]
+            active.append((modes[filter_label], selection) if selection else ())
 
-        raw_values = list(filtered_df[col_name].dropna().unique())
+        else:
+            present = set(index.present_values(universe_bitset))
+            selection = st.session_state.get(key, "(Todos)")
+            selection = selection if selection in present else "(Todos)"
+            active.append([] if selection == "(Todos)" else [selection])
+
+        keys[filter_label] = key
+        selections[filter_label] = selection
+
+    facets = [indexes[cfg["column"]] for cfg in filter_config.values()]
+
+    # Mesmo universo e mesmas seleções da execução anterior: contagens e linhas vêm da sessão
+    frame_key = get_frame_key(df)
+    cache = session_query_cache() if frame_key else None
+    cache_key = None
+
+    if cache is not None:
+        cache_key = frame_key + (
+            "facets",
+            rows_digest(np.asarray(universe_bitset).view(np.int64)),
+            tuple(cfg["column"] for cfg in filter_config.values()),
+            _freeze_selection(active),
+        )
+
+    cached = cache.get(cache_key) if cache_key else None
+
+    if cached is None:
+        cached = facet_counts(facets, active, universe)
+
+        if cache_key:
+            cache.put(cache_key, cached)
+
+    counts, matched = cached
+
+    # Itera sobre filtros na ordem definida
+    for (filter_label, cfg), facet, facet_count in zip(filter_config.items(), facets, counts):
+        col_name = cfg["column"]
+        filter_type = cfg.get("type", "multiselect")
+        selection = selections[filter_label]
+
+        if filter_type == "range":
+            # sem faixa de valores para escolher (coluna vazia ou valor único)
+            if selection is not None:
+                st.session_state[keys[filter_label]] = selection
+
+                selection = st.slider(
+                    filter_label,
+                    min_value=limits[filter_label][0],
+                    max_value=limits[filter_label][1],
+                    key=keys[filter_label],
+                )
+
+            filter_state[col_name] = selection
+            continue
+
+        value_counts = dict(zip(facet.values, facet_count.tolist()))
+        chosen = selection if isinstance(selection, list) else [selection]
+        raw_values = [v for v in facet.values if value_counts[v] > 0 or v in chosen]
 
         # Caso haja sort customizado
         custom_sort = cfg.get("sort_order")
@@ -112,37 +300,59 @@ def dynamic_filters(df: pd.DataFrame, filter_config: dict):
         else:
             valid_values = sorted(raw_values)
 
+        def format_option(v, value_counts=value_counts):
+            return v if v == "(Todos)" else f"{v} ({value_counts.get(v, 0)})"
+
+        # O valor do widget vem da sessão (lido acima)
+        st.session_state[keys[filter_label]] = selection
+
         # Streamlit UI para o filtro
-        if filter_type == "multiselect":
+        if filter_type in ("multiselect", "tags"):
             selection = st.multiselect(
                 filter_label,
                 options=valid_values,
-                default=[v for v in default if v in valid_values],
+                format_func=format_option,
+                key=keys[filter_label],
             )
 
-            # aplica o filtro se tiver seleção
-            if selection:
-                filtered_df = filtered_df[filtered_df[col_name].isin(selection)]
+            if filter_type == "tags":
+                mode_label = st.radio(
+                    "Combinar tags:",
+                    list(TAG_FILTER_MODES),
+                    horizontal=True,
+                    key=f"{keys[filter_label]}::mode",
+                    label_visibility="collapsed",
+                )
+                selection = {"mode": TAG_FILTER_MODES[mode_label], "values": selection}
 
-        elif filter_type == "selectbox":
+        else:
             selection = st.selectbox(
                 filter_label,
                 options=["(Todos)"] + valid_values,
-                index=0
+                format_func=format_option,
+                key=keys[filter_label],
             )
 
-            if selection != "(Todos)":
-                filtered_df = filtered_df[filtered_df[col_name] == selection]
-
-        else:
-            raise ValueError(f"Unsupported filter type: {filter_type}")
-
         # Salva o estado do filtro
         filter_state[col_name] = selection
 
-    return filtered_df, filter_state
+    if query is not None:
+        for cfg, selection in zip(filter_config.values(), active):
+            if cfg.get("type") == "range":
+                query.add_range(cfg["column"], selection)
+            elif cfg.get("type") == "tags":
+                query.add_tags(cfg["column"], selection)
+            else:
+                query.add_facet(cfg["column"], selection)
+
+        return df, filter_state
 
-def sort_ui(df, default_col=None):
+    # Materialização única das linhas selecionadas (na ordem de `df`)
+    rows = selected_rows(matched, positions)
+
+    return df.take(rows), filter_state
+
+def sort_ui(df, default_col=None, query=None):
     """
     UI para ordenação dinâmica de um DataFrame.
 
@@ -152,6 +362,8 @@ def sort_ui(df, default_col=None):
         DataFrame base a ser ordenado.
     default_col : str
         Coluna padrão para ordenação caso o usuário não selecione outra.
+    query : Query
+        Consulta a preencher (opcional): a ordenação é registrada e `df` volta como está.
 
     Retorno
     -------
@@ -167,7 +379,11 @@ def sort_ui(df, default_col=None):
     # Crescente ou decrescente
     ascending = st.radio("Ordem:", ["Crescente", "Decrescente"]) == "Crescente"
 
-    return df.sort_values(by=sort_col, ascending=ascending)
+    if query is not None:
+        query.set_sort(sort_col, ascending)
+        return df
+
+    return sort_frame(df, sort_col, ascending=ascending)
 
 def tag_filter(df, filter_columns):
     """
@@ -194,13 +410,18 @@ def tag_filter(df, filter_columns):
     # Armazena seleções do usuário
     selections = {}
 
-    # DataFrame auxiliar que será filtrado a cada passo
-    filtered_df = df.copy()
+    if not filter_columns:
+        return df, selections
+
+    # Bitset das linhas restantes, refinado a cada passo (sem cópias do DataFrame)
+    bitmaps = get_filter_bitmaps(df, list(filter_columns))
+    any_bitmaps = next(iter(bitmaps.values()))
+    positions, current = rows_bitset(any_bitmaps, df)
 
     for col in filter_columns:
 
         # Ajusta dinamicamente as opções disponíveis
-        available_options = sorted(filtered_df[col].dropna().unique())
+        available_options = sorted(bitmaps[col].present_values(current))
 
         # Caixa de seleção dinâmica
         selection = st.multiselect(
@@ -213,83 +434,360 @@ def tag_filter(df, filter_columns):
 
         # Aplica filtragem parcial para atualizar opções das próximas colunas
         if selection:
-            filtered_df = filtered_df[filtered_df[col].isin(selection)]
+            current = current & bitmaps[col].select(selection)
+
+    # Materialização única das linhas selecionadas
+    rows = selected_rows(bitset_to_mask(current, any_bitmaps.n_rows), positions)
 
-    return filtered_df, selections
+    return df.take(rows), selections
 
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES PARA o SEARCH BOX
 
 def _normalize_text(x: str) -> str:
-    if x is None:
-        return ""
+    return normalize_text(x)
+
+def _set_session_value(key: str, value) -> None:
+    """ Callback que troca o valor de um widget (ex.: aplicar a correção sugerida na busca). """
+    st.session_state[key] = value
+
+def _apply_completion(pills_key: str, input_key: str) -> None:
+    """ Callback do autocompletar: copia o nome escolhido para a caixa de busca. """
+    choice = st.session_state.get(pills_key)
 
-    x = str(x)
+    if choice:
+        st.session_state[input_key] = choice
 
-    x = unicodedata.normalize("NFKD", x)
-    x = "".join(c for c in x if not unicodedata.combining(c))
-    x = re.sub(r"\s+", " ", x).strip().lower()
+    st.session_state[pills_key] = None
+
+def _subset_rows(df: pd.DataFrame, index, prefixes) -> dict:
+    """
+    Linhas de `df` no espaço do índice da aba (`rows`, máscara) e os nomes do autocompletar
+    presentes nelas (`completions`). Ficam no cache compartilhado por (aba, versão, rótulos de
+    `df`, coluna): as teclas seguintes sobre o mesmo subconjunto não refazem o `isin` sobre a
+    aba inteira.
+    """
+    frame_key = get_frame_key(df)
+    key = frame_key + ("subset", labels_digest(df.index.to_numpy()), index.column) if frame_key else None
 
-    return x
+    subset = search_result_cache.get(key) if key else None
 
-def _ensure_search_column(df, column, norm_column):
-    if norm_column not in df.columns:
-        df = df.copy()
-        df[norm_column] = df[column].astype(str).apply(_normalize_text)
-    return df
+    if subset is None:
+        rows = pd.Index(index.labels).isin(df.index)
+        subset = {"rows": rows, "completions": prefixes.allowed_entries(np.flatnonzero(rows))}
 
-def _fuzzy_score(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
+        if key:
+            search_result_cache.put(key, subset)
+
+    return subset
+
+def _universe_signature(df, index) -> tuple:
+    """ Assinatura barata do conjunto de linhas do índice (usada para validar o estado incremental). """
+    return get_frame_key(df), len(index), int(pd.util.hash_array(index.labels).sum())
 
 def search_box(
     df,
     label="🔍 Buscar",
     column="nome",
     norm_column="_search_norm",
-    fuzzy_threshold=0.6,
+    fuzzy_threshold=None,
     max_suggestions=20,
+    max_edit_distance=2,
+    incremental=False,
+    max_completions=8,
+    fields=None,
+    query=None,
 ):
     """
     Busca híbrida robusta:
     - substring
-    - fuzzy
+    - por radical das palavras ("poções" encontra "Poção", "envenenar" encontra "Veneno")
+    - tolerante a erros de digitação (até `max_edit_distance` edições, via dicionário SymSpell)
+    - sugere a correção do termo ("Você quis dizer...?") quando nada casa literalmente
+    - autocompleta o termo com até `max_completions` nomes (índice de prefixos, em ordem de id)
     - ignora acentos
     - ignora espaços
     - NÃO quebra se esquecer de preparar df
+
+    A busca é feita sobre o índice de nomes da aba completa e o resultado (linhas + sugestões)
+    fica no cache LRU compartilhado, chaveado por (aba, versão, coluna, termo, max_edit_distance,
+    max_suggestions). Depois ele é cruzado com as linhas de `df` (categoria, filtros anteriores etc.).
+    As sugestões são os `max_suggestions` melhores nomes distintos, escolhidos por top-k sem ordenar
+    todas as linhas encontradas.
+
+    Com `incremental=True`, a última busca e suas linhas candidatas ficam na sessão: se o novo
+    termo estende o anterior ("espa" → "espad"), apenas as candidatas anteriores são pontuadas
+    de novo; se o termo foi apagado/alterado, a busca volta a considerar o índice inteiro.
+    (Só a varredura por substring é restrita às candidatas: as partes por radical e tolerante a
+    erros sempre consultam os dicionários inteiros, cujo custo independe do tamanho da aba, já
+    que um termo mais longo pode casar por radical ou por erro com linhas novas.)
+
+    Com `fields={coluna: peso}` (ex.: {"spell_name": 3, "spell_type": 2, "spell_description": 1}),
+    a busca passa a considerar todas essas colunas de uma vez, pelo índice ponderado da aba:
+    cada palavra do termo casa por prefixo, a linha precisa casar com todas as palavras e o
+    resultado volta ordenado por relevância. Autocompletar, sugestões e correção continuam
+    baseados em `column`; o modo incremental vale apenas para a busca por nome. Um termo sem
+    nenhuma palavra indexável (só stopwords ou pontuação, ex.: "de", "-") usa a busca por nome.
+
+    Com `query`, o termo é apenas registrado na consulta e `df` volta sem filtrar: a busca roda
+    em `run_query`, depois dos filtros mais baratos e só sobre as linhas restantes (com
+    `incremental=True`, o plano guarda o termo e as linhas da busca anterior no cache da sessão
+    e faz o mesmo estreitamento). Sugestões e correção aparecem no mesmo lugar, após a execução.
+
+    A correção considera só os termos presentes nas linhas de `df`: em páginas que já recortam a
+    aba (categoria, filtros), ela nunca sugere um nome que não está sendo exibido.
+
+    `fuzzy_threshold` (limiar do antigo SequenceMatcher) ainda é aceito, mas é ignorado: a
+    tolerância a erros agora é dada por `max_edit_distance`.
     """
+    if fuzzy_threshold is not None:
+        warnings.warn(
+            "search_box: `fuzzy_threshold` não é mais usado; use `max_edit_distance`.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
 
-    df = _ensure_search_column(df, column, norm_column)
+    input_key = f"_search_input::{label}::{column}"
+    termo = st.text_input(label, key=input_key)
 
-    termo = st.text_input(label)
+    state_key = f"_search_state::{label}::{column}"
+
+    if not termo:
+        if incremental:
+            st.session_state.pop(state_key, None)
+        return df
 
-    if termo:
-        termo_norm = _normalize_text(termo)
+    termo_norm = _normalize_text(termo)
 
-        mask_sub = df[norm_column].str.contains(termo_norm, na=False)
+    # Só espaços: nada a buscar
+    if not termo_norm:
+        return df
 
-        fuzzy_scores = df[norm_column].apply(lambda x: _fuzzy_score(termo_norm, x))
-        mask_fuzzy = fuzzy_scores >= fuzzy_threshold
+    # Termo só com stopwords/pontuação ("a", "de", "-") não tem palavras para o índice
+    # ponderado: cai na busca por nome, em vez de filtrar tudo
+    weighted = bool(fields) and bool(tokenize(termo_norm, normalized=True))
 
-        mask = mask_sub | mask_fuzzy
-        filtered = df[mask]
+    index = get_name_index(df, column, norm_column)
+    speller = get_symspell_index(df, column, norm_column, max_edit_distance)
 
-        suggestions = (
-            filtered.assign(_score=fuzzy_scores)
-            .sort_values("_score", ascending=False)[column]
-            .dropna()
-            .unique()
-            .tolist()
+    # Autocompletar: só consulta o índice de prefixos (restrito às linhas de `df` se for subconjunto)
+    prefixes = get_prefix_index(df, column, norm_column)
+    subset = _subset_rows(df, index, prefixes) if len(df) != len(index) else None
+    allowed = subset["completions"] if subset else None
+
+    completions = [
+        c for c in prefixes.complete(termo_norm, max_completions + 1, allowed)
+        if _normalize_text(c) != termo_norm
+    ][:max_completions]
+
+    if completions:
+        pills_key = f"{input_key}::completions"
+        st.pills(
+            "Autocompletar",
+            options=completions,
+            key=pills_key,
+            on_change=_apply_completion,
+            args=(pills_key, input_key),
+            label_visibility="collapsed",
         )
 
-        if suggestions:
-            st.caption("Sugestões:")
-            st.write(", ".join(suggestions[:max_suggestions]))
+    if query is not None:
+        query.set_search(termo, column, norm_column, max_edit_distance, max_suggestions, fields, incremental)
+        query.feedback["search"] = {"container": st.container(), "input_key": input_key}
+        return df
+
+    frame_key = get_frame_key(df)
+    fields_key = tuple(fields.items()) if weighted else None
+    cache_key = (
+        frame_key + (column, termo_norm, max_edit_distance, max_suggestions, fields_key)
+        if frame_key else None
+    )
+
+    result = search_result_cache.get(cache_key) if cache_key else None
+    signature = _universe_signature(df, index) if incremental else None
+
+    if result is None:
+        candidates = None
+
+        if weighted:
+            positions, scores = get_field_index(df, fields).search(termo_norm)
+            literal = len(positions) > 0
+
         else:
-            st.caption("Nenhuma sugestão encontrada.")
+            if incremental:
+                state = st.session_state.get(state_key)
+
+                if (
+                    state is not None
+                    and state["signature"] == signature
+                    and termo_norm.startswith(state["query"])
+                ):
+                    candidates = state["positions"]
+
+            positions, scores = speller.match(termo_norm, positions=candidates)
+
+            # Correção só quando nada casou literalmente (scores >= 1 são casamentos por substring)
+            literal = bool((scores >= 1.0).any())
+
+        result = {
+            "positions": positions,
+            "scores": scores,
+            "suggestions": index.top_names(positions, scores, max_suggestions),
+            "correction": None if literal else speller.correct(termo_norm),
+        }
+
+        # Só resultados calculados sobre o índice inteiro vão para o cache compartilhado
+        if cache_key and candidates is None:
+            search_result_cache.put(cache_key, result)
+
+    if incremental:
+        st.session_state[state_key] = {
+            "query": termo_norm,
+            "positions": result["positions"],
+            "signature": signature,
+        }
+
+    positions = result["positions"]
+    in_df = subset["rows"][positions] if subset else np.ones(len(positions), dtype=bool)
+
+    if weighted:
+        # resultado ranqueado (as posições já vêm em ordem decrescente de score)
+        filtered = df.loc[index.labels[positions[in_df]]]
+    else:
+        filtered = df[df.index.isin(index.labels[positions[in_df]])]
+
+    if subset is None:
+        suggestions = result["suggestions"]
+        correction = result["correction"]
+    else:
+        suggestions = index.top_names(positions[in_df], result["scores"][in_df], max_suggestions)
+
+        # Correção restrita aos termos das linhas de `df` (quando nada casou literalmente nelas)
+        literal = in_df.any() if weighted else bool((result["scores"][in_df] >= 1.0).any())
+        correction = None if literal else speller.correct(termo_norm, rows=subset["rows"])
+
+    _render_search_feedback(input_key, correction, suggestions)
+
+    return filtered
+
+def _render_search_feedback(input_key: str, correction, suggestions: list) -> None:
+    """ Botão "Você quis dizer...?" e lista de sugestões da busca por nome. """
+    if correction:
+        st.button(
+            f"Você quis dizer: {correction}?",
+            key=f"{input_key}::correction",
+            on_click=_set_session_value,
+            args=(input_key, correction),
+        )
+
+    if suggestions:
+        st.caption("Sugestões:")
+        st.write(", ".join(suggestions))
+    else:
+        st.caption("Nenhuma sugestão encontrada.")
+
+def full_text_search_box(
+    df,
+    label="📜 Busca nas Descrições",
+    column="nome",
+    max_suggestions=10,
+    query=None,
+):
+    """
+    Busca textual ranqueada (BM25) nas colunas de texto longo da aba
+    (*_description, *_observation, consumable_effect):
+    - ignora acentos e stopwords
+    - usa o índice invertido da aba, construído uma vez por versão dos dados
+    - retorna as linhas encontradas em ordem de relevância
+
+    Com `query`, o termo é apenas registrado na consulta e `df` volta sem filtrar (a busca
+    roda em `run_query`, que também preenche a lista dos mais relevantes).
+    """
+
+    termo = st.text_input(label)
+
+    if not termo:
+        return df
+
+    if query is not None:
+        query.set_text(termo)
+        query.feedback["text"] = {
+            "container": st.container(),
+            "column": column,
+            "max_suggestions": max_suggestions,
+        }
+        return df
 
-        return filtered
+    labels, _ = get_fulltext_index(df).search(termo)
+    labels = labels[pd.Index(labels).isin(df.index)]
+
+    filtered = df.loc[labels]
+
+    _render_text_feedback(filtered[column].dropna().unique().tolist(), max_suggestions)
+
+    return filtered
+
+def _render_text_feedback(suggestions: list, max_suggestions: int) -> None:
+    """ Lista dos nomes mais relevantes da busca nas descrições. """
+    if suggestions:
+        st.caption("Mais relevantes:")
+        st.write(", ".join(str(s) for s in suggestions[:max_suggestions]))
+    else:
+        st.caption("Nenhum resultado nas descrições.")
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES DA CONSULTA (BUSCA + FILTROS + ORDENAÇÃO)
+
+def run_query(query: Query, show_plan: bool = False) -> pd.DataFrame:
+    """
+    Executa a consulta preenchida pelos componentes (`search_box`, `full_text_search_box`,
+    `dynamic_filters`, `sort_ui` com `query=...`) em uma única passada sobre os índices da aba:
+    facetas e intervalos (bitmaps) primeiro, depois a busca nas descrições e por último a
+    pontuação por nome, só sobre as linhas restantes. Preenche as sugestões das buscas e, com
+    `show_plan=True` (depuração, desligado por padrão), mostra o plano executado com o tempo
+    de cada passo e a taxa de acerto dos caches de busca (compartilhado e da sessão).
+
+    O resultado fica no cache da sessão (`session_query_cache`): com o mesmo estado de busca,
+    filtros e ordenação, a próxima execução da página só refaz o `take` final.
+
+    Retorna o DataFrame resultante (um único `take`, já na ordem pedida).
+    """
+    plan = QueryPlan(query)
+    result = plan.execute(cache=session_query_cache())
+    extras = result["extras"]
+
+    search_feedback = query.feedback.get("search")
+    if search_feedback and "search" in extras:
+        with search_feedback["container"]:
+            _render_search_feedback(
+                search_feedback["input_key"],
+                extras["search"]["correction"],
+                extras["search"]["suggestions"],
+            )
+
+    text_feedback = query.feedback.get("text")
+    if text_feedback and "text" in extras:
+        ranking = extras["text"]["ranking"]
+        ranking = ranking[result["mask"][ranking]]
+        names = plan.space[text_feedback["column"]].to_numpy()[ranking]
+
+        with text_feedback["container"]:
+            _render_text_feedback(
+                list(dict.fromkeys(n for n in names if not pd.isna(n))),
+                text_feedback["max_suggestions"],
+            )
+
+    if show_plan:
+        if plan.steps:
+            st.caption(f"Plano: {format_report(result['report'])}")
+
+        st.caption(
+            format_stats("Cache de buscas", search_result_cache.stats())
+            + " | "
+            + format_stats("Cache da sessão", session_query_cache().stats())
+        )
 
-    return df
+    return result["frame"]
 
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES DE HIGHLIGHT DE TEXTO.
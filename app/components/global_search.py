@@ -0,0 +1,54 @@
+"""
+Script que contém o componente de busca global entre todos os catálogos do projeto.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import streamlit as st
+
+# RELATIVE IMPORTS
+from app.src.search_index import get_global_search_index
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES UTILITÁRIAS PARA O STREAMLIT
+
+def global_search(pages: dict = None, label: str = "🔎 Busca Global", max_per_catalog: int = 5) -> None:
+    """
+    Campo de busca que procura um nome em todos os catálogos (feitiços, perícias, armas,
+    armaduras, escudos, consumíveis, vantagens e desvantagens) e mostra os resultados
+    agrupados por catálogo.
+
+    Parâmetros
+    ----------
+    pages : dict
+        Mapeamento opcional {arquivo.xlsx: st.Page} usado para criar o link de cada catálogo.
+    label : str
+        Rótulo do campo de busca.
+    max_per_catalog : int
+        Quantidade máxima de resultados exibidos por catálogo.
+    """
+
+    pages = pages or {}
+
+    termo = st.text_input(label, key="global_search_term")
+
+    if not termo:
+        return
+
+    results = get_global_search_index().search(termo, max_per_catalog=max_per_catalog)
+
+    if not results:
+        st.caption("Nada encontrado nos catálogos.")
+        return
+
+    for catalog, hits in results:
+
+        page = pages.get(hits[0]["file"])
+
+        if page is not None:
+            st.page_link(page, label=f"**{catalog}**")
+        else:
+            st.markdown(f"**{catalog}**")
+
+        st.markdown("\n".join(f"- {hit['name']} · _{hit['sheet']}_" for hit in hits))
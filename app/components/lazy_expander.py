@@ -0,0 +1,56 @@
+"""
+Script que contém o expander preguiçoso dos catálogos: o corpo só é montado quando aberto.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import streamlit as st
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+LAZY_STATE_PREFIX = "_lazy"
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES AUXILIARES
+
+def _state_key(key: str) -> str:
+    return f"{LAZY_STATE_PREFIX}::{key}"
+
+def _toggle(state_key: str) -> None:
+    """ Callback do cabeçalho: abre/fecha. """
+    st.session_state[state_key] = not st.session_state.get(state_key, False)
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES UTILITÁRIAS PARA O STREAMLIT
+
+def lazy_expander(label: str, key: str):
+    """
+    Expander que monta o corpo apenas quando está aberto. O `st.expander` executa o corpo
+    de todos os itens (mesmo fechados); aqui o cabeçalho é um botão e o estado aberto/fechado
+    fica na sessão (`_lazy::{key}`), então um item fechado custa só o título e o custo da
+    página acompanha o número de itens abertos.
+
+    Retorna o container do corpo (aberto) ou None (fechado):
+
+        body = lazy_expander(nome, key=...)
+        if body is not None:
+            with body:
+                ...
+    """
+    state_key = _state_key(key)
+    opened = st.session_state.get(state_key, False)
+
+    st.button(
+        f"{'▾' if opened else '▸'} {label}",
+        key=f"{state_key}::header",
+        on_click=_toggle,
+        args=(state_key,),
+        use_container_width=True,
+    )
+
+    if not opened:
+        return None
+
+    return st.container(border=True)
@@ -0,0 +1,191 @@
+"""
+Script que contém o renderizador paginado (em janelas) das fichas completas dos catálogos.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import pandas as pd
+import streamlit as st
+
+# RELATIVE IMPORTS
+from app.src.data_loader import get_frame_key
+from app.src.query_planner import labels_digest
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+DEFAULT_PAGE_SIZE = 20
+PAGE_SIZE_OPTIONS = [10, 20, 50, 100]
+
+# Modos de navegação: páginas (◀ página ▶) ou "carregar mais" (a janela cresce no fim)
+WINDOW_MODES = ("pages", "more")
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES AUXILIARES
+
+def _window_key(df: pd.DataFrame, key: str = None) -> str:
+    """ Prefixo das chaves de sessão da janela (por aba, quando ela é conhecida). """
+    if key:
+        return f"_window::{key}"
+
+    frame_key = get_frame_key(df)
+
+    if frame_key:
+        return f"_window::{frame_key[0]}::{frame_key[1]}"
+
+    return "_window"
+
+def _rows_signature(df: pd.DataFrame) -> str:
+    """ Assinatura das linhas (e da ordem) de `df`: outro resultado volta para o começo. """
+    return labels_digest(df.index.to_numpy())
+
+def _shift_page(page_key: str, delta: int, n_pages: int) -> None:
+    """ Callback dos botões ◀/▶. """
+    page = st.session_state.get(page_key, 1) + delta
+    st.session_state[page_key] = min(max(page, 1), n_pages)
+
+def _reset_page(page_key: str) -> None:
+    """ Callback do tamanho da página: volta para a primeira. """
+    st.session_state[page_key] = 1
+
+def _grow_window(limit_key: str, step: int) -> None:
+    """ Callback do "Carregar mais". """
+    st.session_state[limit_key] = st.session_state.get(limit_key, step) + step
+
+def window_records(window: pd.DataFrame):
+    """
+    Linhas da janela como (rótulo, {coluna: valor}), sem `iterrows` (que monta uma Series
+    por linha): os valores saem de uma única conversão da janela.
+    """
+    return zip(window.index, window.to_dict("records"))
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES UTILITÁRIAS PARA O STREAMLIT
+
+def _page_controls(prefix: str, n_rows: int, page_size: int, position: str) -> None:
+    """ Botões ◀/▶ (e, no topo, o seletor de página e o tamanho da página). """
+    page_key, size_key = f"{prefix}::page", f"{prefix}::size"
+    n_pages = max(1, -(-n_rows // page_size))
+
+    if position == "top":
+        col_prev, col_page, col_next, col_size = st.columns([1, 3, 1, 2], vertical_alignment="bottom")
+
+        with col_page:
+            st.selectbox(
+                "Página",
+                options=list(range(1, n_pages + 1)),
+                format_func=lambda p: f"Página {p} de {n_pages}",
+                key=page_key,
+                label_visibility="collapsed",
+            )
+
+        with col_size:
+            st.selectbox(
+                "Fichas por página",
+                options=PAGE_SIZE_OPTIONS,
+                format_func=lambda n: f"{n} por página",
+                key=size_key,
+                on_change=_reset_page,
+                args=(page_key,),
+                label_visibility="collapsed",
+            )
+    else:
+        col_prev, _, col_next = st.columns([1, 4, 1])
+
+    page = st.session_state[page_key]
+
+    with col_prev:
+        st.button(
+            "◀", key=f"{prefix}::prev::{position}", disabled=page <= 1,
+            on_click=_shift_page, args=(page_key, -1, n_pages),
+        )
+
+    with col_next:
+        st.button(
+            "▶", key=f"{prefix}::next::{position}", disabled=page >= n_pages,
+            on_click=_shift_page, args=(page_key, 1, n_pages),
+        )
+
+def render_window(
+    df: pd.DataFrame,
+    render_card,
+    key: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    mode: str = "pages",
+) -> pd.DataFrame:
+    """
+    Renderiza apenas uma janela das linhas de `df` (já na ordem de exibição), chamando
+    `render_card(rótulo, linha)` para cada uma. A janela é um recorte por posição
+    (`df.iloc[início:fim]`), então o tempo de renderização acompanha o tamanho da página, e
+    não o do catálogo.
+
+    - mode="pages": controles ◀ / página / ▶ e tamanho da página (no topo e ◀/▶ no final);
+    - mode="more": começa com `page_size` fichas e o botão "Carregar mais" aumenta a janela.
+
+    O estado (página, tamanho, limite) fica na sessão, com prefixo `key` (por padrão, a aba de
+    `df`); quando o conjunto de linhas muda (outro filtro, outra busca), a janela volta para
+    o começo.
+
+    Retorna a janela renderizada.
+    """
+    if mode not in WINDOW_MODES:
+        raise ValueError(f"Modo de janela não suportado: {mode}")
+
+    prefix = _window_key(df, key)
+    page_key, size_key, limit_key = f"{prefix}::page", f"{prefix}::size", f"{prefix}::limit"
+    signature_key = f"{prefix}::signature"
+
+    # Outro resultado (filtros, busca, ordenação): volta para o começo
+    signature = _rows_signature(df)
+    if st.session_state.get(signature_key) != signature:
+        st.session_state[signature_key] = signature
+        st.session_state[page_key] = 1
+        st.session_state.pop(limit_key, None)
+
+    n_rows = len(df)
+
+    if n_rows == 0:
+        return df
+
+    if mode == "more":
+        limit = st.session_state.get(limit_key, page_size)
+        window = df.iloc[:limit]
+
+        st.caption(f"Mostrando {len(window)} de {n_rows}")
+
+        for label, row in window_records(window):
+            render_card(label, row)
+
+        if limit < n_rows:
+            st.button(
+                f"Carregar mais ({n_rows - limit} restantes)",
+                key=f"{prefix}::more",
+                on_click=_grow_window,
+                args=(limit_key, page_size),
+            )
+
+        return window
+
+    if st.session_state.get(size_key) not in PAGE_SIZE_OPTIONS:
+        st.session_state[size_key] = page_size if page_size in PAGE_SIZE_OPTIONS else DEFAULT_PAGE_SIZE
+
+    size = st.session_state[size_key]
+    n_pages = max(1, -(-n_rows // size))
+    st.session_state[page_key] = min(max(st.session_state.get(page_key, 1), 1), n_pages)
+
+    if n_pages > 1:
+        _page_controls(prefix, n_rows, size, "top")
+
+    start = (st.session_state[page_key] - 1) * size
+    window = df.iloc[start:start + size]
+
+    st.caption(f"Mostrando {start + 1}–{start + len(window)} de {n_rows}")
+
+    for label, row in window_records(window):
+        render_card(label, row)
+
+    if n_pages > 1:
+        _page_controls(prefix, n_rows, size, "bottom")
+
+    return window
@@ -4,6 +4,7 @@
 import os
 import streamlit as st
 from itertools import product
+from functools import partial
 import math
 import pandas as pd
 
@@ -12,11 +13,13 @@ from streamlit_option_menu import option_menu
 warnings.simplefilter(action='ignore', category=UserWarning)
 
 # RELATIVE IMPORTS
-from app.utils import TIER_CONFIG, TIER_COLORS, TIER_ORDER, TIER_NAME_SETS
+from app.utils import TIER_CONFIG, TIER_ORDER, TIER_NAME_SETS
 DEFAULT_TIER_SET = "qualidade"
 
 from app.src.data_loader import read_excel_data
-from app.components.filters import dynamic_filters, search_box, diff_text_granular
+from app.src.glossary import get_glossary_html
+from app.components.filters import dynamic_filters, search_box, full_text_search_box
+from app.components.cards import add_tier_levels, render_tiered_cards
 
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES AUXILIARES DAS REGRAS
@@ -279,6 +282,38 @@ def get_row_by_tier(df: pd.DataFrame, tier: str):
         return None
     return filtered.iloc[0]
 
+def consumable_card(h, tier: str, consumable_type: str) -> dict:
+    """ Campos da ficha de um consumível (argumentos de `render_card`). """
+
+    # campo específico de cada tipo de consumível (ao lado do efeito)
+    extra_field = (None, None)
+
+    if consumable_type in ("Poções", "Elixires"):
+        extra_field = ("Toxicidade", h("consumable_toxicity"))
+
+    elif consumable_type in ("Venenos"):
+        extra_field = ("Métodos de Aplicação", h("consumable_method"))
+
+    elif consumable_type in ("Bombas"):
+        extra_field = ("Área de Efeito", h("consumable_effect_area"))
+
+    return {
+        "header": [("Tier", tier)],
+        "fields": [
+            ("Categoria", h("consumable_category")),
+            ("Duração", h("consumable_duration")),
+            ("Efeito", h("consumable_effect")),
+            extra_field,
+            ("Preço", f"{h('consumable_price')} moedas"),
+            ("Peso", f"{h('consumable_weight')} kg"),
+        ],
+        "sections": [
+            ("Descrição", h("consumable_description")),
+            ("Observação", h("consumable_observation")),
+        ],
+        "section_columns": 2,
+    }
+
 def render_consumable_sub_page(
     df_consumables: pd.DataFrame,
     consumable_type: str,
@@ -290,197 +325,25 @@ def render_consumable_sub_page(
 
     tier_map = TIER_NAME_SETS[tier_set]
 
-    # -----------------------------
-    # Converter nome do tier -> nível numérico
-    # -----------------------------
-    name_to_level = {v: k for k, v in tier_map.items()}
-
-    df["tier_level"] = (
-        df["consumable_tier"]
-        .astype(str)
-        .str.strip()
-        .map(name_to_level)
+    # HTML dos textos com o glossário marcado (gerado uma vez por versão dos dados)
+    glossary_html = {
+        field: get_glossary_html(df_consumables, field)
+        for field in ("consumable_effect", "consumable_description", "consumable_observation")
+        if field in df_consumables.columns
+    }
+
+    add_tier_levels(df, "consumable_tier", tier_map)
+
+    render_tiered_cards(
+        df,
+        "consumable_name",
+        "consumable_id",
+        "consumable_tier",
+        tier_map,
+        partial(consumable_card, consumable_type=consumable_type),
+        glossary_html=glossary_html,
     )
 
-    df["tier_level"] = pd.Categorical(
-        df["tier_level"],
-        categories=TIER_ORDER,
-        ordered=True
-    )
-
-    # -----------------------------
-    # ordenar por menor id
-    # -----------------------------
-    order = (
-        df.groupby("consumable_name")["consumable_id"]
-        .min()
-        .sort_values()
-        .index
-    )
-
-    for consumable_name in order:
-
-        df_consumable = (
-            df[df["consumable_name"] == consumable_name]
-            .sort_values("tier_level")
-            .reset_index(drop=True)
-        )
-
-        with st.expander(consumable_name):
-
-            tiers_available = [
-                int(t)
-                for t in df_consumable["tier_level"]
-                .dropna()
-                .unique()
-            ]
-
-            tiers_available = sorted(tiers_available)
-
-            if not tiers_available:
-                st.warning("Sem tiers disponíveis")
-                continue
-
-            tier_labels = [tier_map[t] for t in tiers_available]
-
-            default_level = 1 if 1 in tiers_available else tiers_available[0]
-            default_label = tier_map[default_level]
-
-            # -----------------------------
-            # Controle de seleção
-            # -----------------------------
-            try:
-                selected_label = st.segmented_control(
-                    "Tier",
-                    options=tier_labels,
-                    default=default_label,
-                    key=f"tier_segment_{consumable_name}"
-                )
-            except Exception:
-                selected_label = st.radio(
-                    "Tier",
-                    options=tier_labels,
-                    index=tier_labels.index(default_label),
-                    horizontal=True,
-                    key=f"tier_radio_{consumable_name}"
-                )
-
-            selected_level = name_to_level[selected_label]
-
-            # -----------------------------
-            # Buscar linha selecionada
-            # -----------------------------
-            row = df_consumable[df_consumable["tier_level"] == selected_level]
-
-            if row.empty:
-                continue
-
-            row = row.iloc[0]
-
-            # -----------------------------
-            # tier anterior
-            # -----------------------------
-            prev_row = None
-            idx = tiers_available.index(selected_level)
-
-            if idx > 0:
-                prev_level = tiers_available[idx - 1]
-                prev = df_consumable[df_consumable["tier_level"] == prev_level]
-                if not prev.empty:
-                    prev_row = prev.iloc[0]
-
-            tier_color = TIER_COLORS.get(selected_level, "#374151")
-
-            # -----------------------------
-            # Highlight helper
-            # -----------------------------
-            def h(field):
-
-                if prev_row is None:
-                    value = row[field]
-
-                    if isinstance(value, (int, float)):
-                        return f"{float(value):.1f}"
-
-                    return str(value)
-
-                value = row[field]
-                prev = prev_row[field]
-
-                # textos longos → diff granular
-                if isinstance(value, str):
-                    return diff_text_granular(value, prev, tier_color)
-
-                # números → round + highlight
-                if isinstance(value, (int, float)):
-                    value_fmt = f"{float(value):.1f}"
-                    prev_fmt = f"{float(prev):.1f}" if isinstance(prev, (int, float)) else prev
-
-                    if value_fmt != prev_fmt:
-                        return f"<span style='color:{tier_color}; font-weight:600'>{value_fmt}</span>"
-
-                    return value_fmt
-
-                # fallback
-                if value != prev:
-                    return f"<span style='color:{tier_color}; font-weight:600'>{value}</span>"
-
-                return str(value)
-
-            # -----------------------------
-            # HEADER
-            # -----------------------------
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(
-                    f"**Tier:** <span style='color:{tier_color}; font-weight:700'>{tier_map[selected_level]}</span>",
-                    unsafe_allow_html=True
-                )
-
-            # -----------------------------
-            # CAMPOS
-            # -----------------------------
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Categoria:** {h('consumable_category')}", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"**Duração:** {h('consumable_duration')}", unsafe_allow_html=True)
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Efeito:** {h('consumable_effect')}", unsafe_allow_html=True)
-
-            with col2:
-
-                if consumable_type in ("Poções", "Elixires"):
-                    st.markdown(f"**Toxicidade:** {h('consumable_toxicity')}", unsafe_allow_html=True)
-
-                elif consumable_type in ("Venenos"):
-                    st.markdown(f"**Métodos de Aplicação:** {h('consumable_method')}", unsafe_allow_html=True)
-
-                elif consumable_type in ("Bombas"):
-                    st.markdown(f"**Área de Efeito:** {h('consumable_effect_area')}", unsafe_allow_html=True)
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Preço:** {h('consumable_price')} moedas", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"**Peso:** {h('consumable_weight')} kg", unsafe_allow_html=True)
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Descrição:**\n\n{h('consumable_description')}", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"**Observação:**\n\n{h('consumable_observation')}", unsafe_allow_html=True)
-
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES DE VISUALIZAÇÃO DOS CONSUMÍVEIS
 
@@ -499,11 +362,21 @@ def potions(df_dict: dict) -> None:
             column="consumable_name"
         )
 
+        df = full_text_search_box(
+            df=df,
+            label="📜 Busca nas Descrições",
+            column="consumable_name"
+        )
+
         filter_config = {
             "Filtrar por Tipo:": {
                 "column": "consumable_category",
                 "type": "multiselect",
                 "default": []
+            },
+            "Filtrar por Toxicidade:": {
+                "column": "consumable_toxicity",
+                "type": "range"
             }
         }
 
@@ -533,6 +406,12 @@ def poisons(df_dict: dict) -> None:
             column="consumable_name"
         )
 
+        df = full_text_search_box(
+            df=df,
+            label="📜 Busca nas Descrições",
+            column="consumable_name"
+        )
+
         filter_config = {
             "Filtrar por Tipo:": {
                 "column": "consumable_category",
@@ -567,11 +446,21 @@ def elixirs(df_dict: dict) -> None:
             column="consumable_name"
         )
 
+        df = full_text_search_box(
+            df=df,
+            label="📜 Busca nas Descrições",
+            column="consumable_name"
+        )
+
         filter_config = {
             "Filtrar por Tipo:": {
                 "column": "consumable_category",
                 "type": "multiselect",
                 "default": []
+            },
+            "Filtrar por Toxicidade:": {
+                "column": "consumable_toxicity",
+                "type": "range"
             }
         }
 
@@ -601,6 +490,12 @@ def bombs(df_dict: dict) -> None:
             column="consumable_name"
         )
 
+        df = full_text_search_box(
+            df=df,
+            label="📜 Busca nas Descrições",
+            column="consumable_name"
+        )
+
         filter_config = {
             "Filtrar por Tipo:": {
                 "column": "consumable_category",
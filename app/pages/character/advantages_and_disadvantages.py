@@ -9,37 +9,52 @@ warnings.simplefilter(action='ignore', category=UserWarning)
 
 # RELATIVE IMPORTS
 from app.src.data_loader import read_excel_data
-from app.components.filters import dynamic_filters, search_box
+from app.src.sort_index import sort_frame
+from app.components.filters import dynamic_filters, search_box, full_text_search_box
+from app.components.pagination import render_window
+from app.components.lazy_expander import lazy_expander
 
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES AUXILIARES
 
-def render_view_full(view: str ,df: pd.DataFrame):
+def render_view_card(view: str, row: dict):
     """
-    Renderiza cada as vantagens e desvantagens em modo detalhado,
-    com todos os campos e layout visual expandido.
+    Renderiza a ficha completa de uma vantagem ou desvantagem (`row` é a linha como dicionário).
     """
-    df_sorted = df.sort_values(by=f"{view}_id")
+    body = lazy_expander(f"{row[f'{view}_box_name']}", key=f"{view}::{row[f'{view}_id']}")
 
-    for _, row in df_sorted.iterrows():
+    if body is None:
+        return
 
-        with st.expander(f"{row[f'{view}_box_name']}"):
+    with body:
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**ID:** {row[f'{view}_id']}")
-            with col2: st.write(f"**Nome:** {row[f'{view}_name']}")
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**ID:** {row[f'{view}_id']}")
+        with col2: st.write(f"**Nome:** {row[f'{view}_name']}")
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**Custo:** {row[f'{view}_cost']}")
-            with col2: st.write(f"**Tipo:** {row[f'{view}_type']}")
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**Custo:** {row[f'{view}_cost']}")
+        with col2: st.write(f"**Tipo:** {row[f'{view}_type']}")
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**Fonte:** {row[f'{view}_source_book']}")
-            with col2: st.write(f"**Página:** {row[f'{view}_source_page']}")
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**Fonte:** {row[f'{view}_source_book']}")
+        with col2: st.write(f"**Página:** {row[f'{view}_source_page']}")
 
-            st.markdown(f"**Descrição:**\n\n{row[f'{view}_description']}")
+        st.markdown(f"**Descrição:**\n\n{row[f'{view}_description']}")
 
-def render_view_list(view: str, df: pd.DataFrame):
+def render_view_full(view: str ,df: pd.DataFrame, ranked: bool = False):
+    """
+    Renderiza cada as vantagens e desvantagens em modo detalhado,
+    com todos os campos e layout visual expandido.
+
+    Apenas a página atual de fichas é renderizada (`render_window`). Com `ranked=True` (há
+    termo de busca), as fichas seguem a ordem de relevância de `df`; senão, a ordem do id.
+    """
+    df_sorted = df if ranked else sort_frame(df, f"{view}_id")
+
+    render_window(df_sorted, lambda _, row: render_view_card(view, row))
+
+def render_view_list(view: str, df: pd.DataFrame, ranked: bool = False):
     """
     Renderiza uma visão compacta dos feitiços.
     Mostra apenas informações essenciais em formato de tabela.
@@ -49,7 +64,10 @@ def render_view_list(view: str, df: pd.DataFrame):
     compact_df = df[
         [f'{view}_id', f'{view}_name', f'{view}_type', f'{view}_cost',
          f'{view}_source_book', f'{view}_source_page']
-    ].sort_values(f'{view}_id')
+    ]
+
+    if not ranked:
+        compact_df = sort_frame(compact_df, f'{view}_id')
 
     st.dataframe(compact_df, use_container_width=True)
 
@@ -65,12 +83,24 @@ def advantages(df_dict: dict) -> None:
     # Filtros
     with st.expander(f"🎯 Filtros de Vantages"):
 
+        df_all = df
+
         df = search_box(
             df=df,
             label=f"🔍 Busca de Vantages",
-            column=f"advantage_name"
+            column=f"advantage_name",
+            fields={"advantage_name": 3, "advantage_type": 2, "advantage_description": 1}
         )
 
+        df = full_text_search_box(
+            df=df,
+            label="📜 Busca nas Descrições",
+            column="advantage_name"
+        )
+
+        # com termo em alguma das buscas, `df` já vem na ordem que elas devolvem (relevância)
+        ranked = df is not df_all
+
         filter_config = {
             "Filtrar por Tipo:": {
                 "column": f"advantage_type",
@@ -99,9 +129,9 @@ def advantages(df_dict: dict) -> None:
     # Renderização
     try:
         if view_mode == "Ficha Completa":
-            render_view_full("advantage", df)
+            render_view_full("advantage", df, ranked)
         else:
-            render_view_list("advantage", df)
+            render_view_list("advantage", df, ranked)
 
     except Exception as e:
         st.error(f"Falha ao renderizar Vantagens.")
@@ -116,12 +146,24 @@ def disadvantages(df_dict: dict) -> None:
     # Filtros
     with st.expander(f"🎯 Filtros de Desvantagens"):
 
+        df_all = df
+
         df = search_box(
             df=df,
             label=f"🔍 Busca de Desvantagens",
-            column=f"disadvantage_name"
+            column=f"disadvantage_name",
+            fields={"disadvantage_name": 3, "disadvantage_type": 2, "disadvantage_description": 1}
         )
 
+        df = full_text_search_box(
+            df=df,
+            label="📜 Busca nas Descrições",
+            column="disadvantage_name"
+        )
+
+        # com termo em alguma das buscas, `df` já vem na ordem que elas devolvem (relevância)
+        ranked = df is not df_all
+
         filter_config = {
             "Filtrar por Tipo:": {
                 "column": f"disadvantage_type",
@@ -150,9 +192,9 @@ def disadvantages(df_dict: dict) -> None:
     # Renderização
     try:
         if view_mode == "Ficha Completa":
-            render_view_full("disadvantage", df)
+            render_view_full("disadvantage", df, ranked)
         else:
-            render_view_list("disadvantage", df)
+            render_view_list("disadvantage", df, ranked)
 
     except Exception as e:
         st.error(f"Falha ao renderizar Desvantagens.")
@@ -10,56 +10,74 @@ warnings.simplefilter(action='ignore', category=UserWarning)
 
 # RELATIVE IMPORTS
 from app.src.data_loader import read_excel_data
-from app.components.filters import dynamic_filters, search_box
+from app.src.glossary import get_glossary_html
+from app.src.query_planner import Query
+from app.components.filters import dynamic_filters, search_box, full_text_search_box, run_query
+from app.components.pagination import render_window
+from app.components.lazy_expander import lazy_expander
 
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES AUXILIARES
 
-def render_skills_full(df: pd.DataFrame):
+def render_skill_card(label, row: dict, descriptions: pd.Series):
     """
-    Renderiza cada as vantagens e desvantagens em modo detalhado,
-    com todos os campos e layout visual expandido.
+    Renderiza a ficha completa de uma perícia (`row` é a linha como dicionário).
     """
-    df_sorted = df.sort_values(by="skill_id")
+    body = lazy_expander(f"{row['skill_box_name']}", key=f"skill::{row['skill_id']}")
+
+    if body is None:
+        return
+
+    with body:
 
-    for _, row in df_sorted.iterrows():
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**ID:** {row['skill_id']}")
+        with col2: st.write(f"**Nome:** {row['skill_name']}")
 
-        with st.expander(f"{row['skill_box_name']}"):
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**Categoria:** {row['skill_category']}")
+        with col2:
+            st.write(f"**Tipo:** {'Mental' if row['skill_type'] == 'M' else 'Física'}")
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**ID:** {row['skill_id']}")
-            with col2: st.write(f"**Nome:** {row['skill_name']}")
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**Dificuldade:** {row['skill_difficulty']}")
+        with col2: st.write(f"**Status Base:** {row['skill_base_status']}")
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**Categoria:** {row['skill_category']}")
-            with col2:
-                st.write(f"**Tipo:** {'Mental' if row['skill_type'] == 'M' else 'Física'}")
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**Nível Pré-definido:** {row['skill_pre_defined_level']}")
+        with col2: st.write(f"**Pré-requisitos:** {row['skill_prerequisite']}")
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**Dificuldade:** {row['skill_difficulty']}")
-            with col2: st.write(f"**Status Base:** {row['skill_base_status']}")
+        col1, col2 = st.columns(2)
+        with col1: st.write(f"**Fonte:** {row['skill_source_book']}")
+        with col2: st.write(f"**Página:** {row['skill_source_page']}")
+
+        st.markdown(f"**Descrição:**\n\n{descriptions[label]}", unsafe_allow_html=True)
+
+def render_skills_full(df: pd.DataFrame):
+    """
+    Renderiza cada as vantagens e desvantagens em modo detalhado,
+    com todos os campos e layout visual expandido.
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**Nível Pré-definido:** {row['skill_pre_defined_level']}")
-            with col2: st.write(f"**Pré-requisitos:** {row['skill_prerequisite']}")
+    Apenas a página atual de fichas é renderizada (`render_window`), na ordem de `df` (id, ou
+    relevância quando há termo de busca: `run_query` já entrega ordenado).
+    """
 
-            col1, col2 = st.columns(2)
-            with col1: st.write(f"**Fonte:** {row['skill_source_book']}")
-            with col2: st.write(f"**Página:** {row['skill_source_page']}")
+    # Descrições com o glossário marcado (HTML gerado uma vez por versão dos dados)
+    descriptions = get_glossary_html(df, "skill_description")
 
-            st.markdown(f"**Descrição:**\n\n{row['skill_description']}")
+    render_window(df, lambda label, row: render_skill_card(label, row, descriptions))
 
 def render_skills_list(df: pd.DataFrame):
     """
     Renderiza uma visão compacta dos feitiços.
-    Mostra apenas informações essenciais em formato de tabela.
+    Mostra apenas informações essenciais em formato de tabela, na ordem de `df`.
     """
     st.subheader("Lista Compacta")
 
     compact_df = df[
         ['skill_id', 'skill_name', 'skill_type', 'skill_difficulty',
          'skill_base_status', 'skill_source_book', 'skill_source_page']
-    ].sort_values('skill_id')
+    ]
 
     st.dataframe(compact_df, use_container_width=True)
 
@@ -85,10 +103,22 @@ def skills(df_dict: dict) -> None:
 
     with st.expander(f"🎯 Filtros de Perícias"):
 
-        df_category = search_box(
+        # Busca, filtros e ordenação preenchem uma única consulta, executada no final
+        query = Query(df_category)
+
+        search_box(
             df=df_category,
             label=f"🔍 Busca de Perícias",
-            column="skill_name"
+            column="skill_name",
+            incremental=True,
+            query=query
+        )
+
+        full_text_search_box(
+            df=df_category,
+            label="📜 Busca nas Descrições",
+            column="skill_name",
+            query=query
         )
 
         filter_config = {
@@ -103,10 +133,22 @@ def skills(df_dict: dict) -> None:
                 "type": "multiselect",
                 "default": [],
                 "sort_order": ["F", "M", "D", "MD"]
+            },
+
+            "Filtrar por Pré-requisito:": {
+                "column": "skill_prerequisite",
+                "type": "tags",
+                "default": []
             }
         }
 
-        df_category, selected_filters = dynamic_filters(df_category, filter_config)
+        dynamic_filters(df_category, filter_config, query=query)
+
+        # com termo de busca, o resultado fica na ordem de relevância
+        if not query.ranked:
+            query.set_sort("skill_id")
+
+        df_category = run_query(query)
 
         if df_category.empty:
             st.warning(f"Nenhuma Perícia encontrada com os filtros aplicados.")
@@ -12,11 +12,12 @@ from streamlit_option_menu import option_menu
 warnings.simplefilter(action='ignore', category=UserWarning)
 
 # RELATIVE IMPORTS
-from app.utils import TIER_CONFIG, TIER_COLORS, TIER_ORDER, TIER_NAME_SETS
+from app.utils import TIER_CONFIG, TIER_NAME_SETS
 DEFAULT_TIER_SET = "qualidade"
 
 from app.src.data_loader import read_excel_data
-from app.components.filters import dynamic_filters, search_box, diff_text_granular
+from app.components.filters import dynamic_filters, search_box
+from app.components.cards import add_tier_levels, render_tiered_cards
 
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES AUXILIARES DAS ARMADURAS
@@ -27,6 +28,38 @@ def get_row_by_tier(df: pd.DataFrame, tier: str):
         return None
     return filtered.iloc[0]
 
+def armor_card(h, tier: str) -> dict:
+    """ Campos da ficha de uma armadura (argumentos de `render_card`). """
+    return {
+        "header": [
+            ("Tier", tier),
+            ("Tipo", h("armor_type")),
+        ],
+        "fields": [
+            ("Slot", h("armor_piece_location")),
+            ("Resistência (DR)", h("armor_damage_resistence")),
+            ("Preço", f"{h('armor_price')} moedas"),
+            ("Peso", f"{h('armor_weight')} kg"),
+        ],
+        "sections": [("Descrição", h("armor_description"))],
+    }
+
+def shield_card(h, tier: str) -> dict:
+    """ Campos da ficha de um escudo (argumentos de `render_card`). """
+    return {
+        "header": [
+            ("Tier", tier),
+            ("Tipo", h("shield_type")),
+        ],
+        "fields": [
+            ("Pontos de Vida", h("shield_hit_points")),
+            ("Resistência (DR)", h("shield_damage_resistence")),
+            ("Preço", f"{h('shield_price')} moedas"),
+            ("Peso", f"{h('shield_weight')} kg"),
+        ],
+        "sections": [("Descrição", h("shield_description"))],
+    }
+
 def render_armor_page(
     df_armors: pd.DataFrame,
     tier_set: str = DEFAULT_TIER_SET
@@ -37,178 +70,9 @@ def render_armor_page(
 
     tier_map = TIER_NAME_SETS[tier_set]
 
-    # -----------------------------
-    # Converter nome -> nível
-    # -----------------------------
-    name_to_level = {v: k for k, v in tier_map.items()}
-
-    df["tier_level"] = (
-        df["armor_tier"]
-        .astype(str)
-        .str.strip()
-        .map(name_to_level)
-    )
-
-    df["tier_level"] = pd.Categorical(
-        df["tier_level"],
-        categories=TIER_ORDER,
-        ordered=True
-    )
-
-    # -----------------------------
-    # ordenar armaduras
-    # -----------------------------
-    order = (
-        df.groupby("armor_name")["armor_id"]
-        .min()
-        .sort_values()
-        .index
-    )
-
-    for armor_name in order:
-
-        df_armor = (
-            df[df["armor_name"] == armor_name]
-            .sort_values("tier_level")
-            .reset_index(drop=True)
-        )
-
-        with st.expander(armor_name):
-
-            tiers_available = [
-                int(t)
-                for t in df_armor["tier_level"]
-                .dropna()
-                .unique()
-            ]
-
-            tiers_available = sorted(tiers_available)
-
-            if not tiers_available:
-                st.warning("Sem tiers disponíveis")
-                continue
-
-            tier_labels = [tier_map[t] for t in tiers_available]
-
-            default_level = 1 if 1 in tiers_available else tiers_available[0]
-            default_label = tier_map[default_level]
-
-            # -----------------------------
-            # seleção de tier
-            # -----------------------------
-            try:
-                selected_label = st.segmented_control(
-                    "Tier",
-                    options=tier_labels,
-                    default=default_label,
-                    key=f"tier_segment_{armor_name}"
-                )
-            except Exception:
-                selected_label = st.radio(
-                    "Tier",
-                    options=tier_labels,
-                    index=tier_labels.index(default_label),
-                    horizontal=True,
-                    key=f"tier_radio_{armor_name}"
-                )
-
-            selected_level = name_to_level[selected_label]
-
-            # -----------------------------
-            # linha atual
-            # -----------------------------
-            row = df_armor[df_armor["tier_level"] == selected_level]
-
-            if row.empty:
-                continue
-
-            row = row.iloc[0]
+    add_tier_levels(df, "armor_tier", tier_map)
 
-            # -----------------------------
-            # tier anterior
-            # -----------------------------
-            prev_row = None
-            idx = tiers_available.index(selected_level)
-
-            if idx > 0:
-                prev_level = tiers_available[idx - 1]
-                prev = df_armor[df_armor["tier_level"] == prev_level]
-
-                if not prev.empty:
-                    prev_row = prev.iloc[0]
-
-            tier_color = TIER_COLORS.get(selected_level, "#374151")
-
-            # -----------------------------
-            # highlight helper
-            # -----------------------------
-            def h(field):
-
-                if prev_row is None:
-                    value = row[field]
-
-                    if isinstance(value, (int, float)):
-                        return f"{float(value):.1f}"
-
-                    return str(value)
-
-                value = row[field]
-                prev = prev_row[field]
-
-                # textos longos → diff granular
-                if isinstance(value, str):
-                    return diff_text_granular(value, prev, tier_color)
-
-                # números → round + highlight
-                if isinstance(value, (int, float)):
-                    value_fmt = f"{float(value):.1f}"
-                    prev_fmt = f"{float(prev):.1f}" if isinstance(prev, (int, float)) else prev
-
-                    if value_fmt != prev_fmt:
-                        return f"<span style='color:{tier_color}; font-weight:600'>{value_fmt}</span>"
-
-                    return value_fmt
-
-                # fallback
-                if value != prev:
-                    return f"<span style='color:{tier_color}; font-weight:600'>{value}</span>"
-
-                return str(value)
-
-            # -----------------------------
-            # HEADER
-            # -----------------------------
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(
-                    f"**Tier:** <span style='color:{tier_color}; font-weight:700'>{tier_map[selected_level]}</span>",
-                    unsafe_allow_html=True
-                )
-
-            with col2:
-                st.markdown(f"**Tipo:** {h('armor_type')}", unsafe_allow_html=True)
-
-            # -----------------------------
-            # CAMPOS
-            # -----------------------------
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Slot:** {h('armor_piece_location')}", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"**Resistência (DR):** {h('armor_damage_resistence')}", unsafe_allow_html=True)
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Preço:** {h('armor_price')} moedas", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"**Peso:** {h('armor_weight')} kg", unsafe_allow_html=True)
-
-            st.markdown(f"**Descrição:**\n\n{h('armor_description')}", unsafe_allow_html=True)
+    render_tiered_cards(df, "armor_name", "armor_id", "armor_tier", tier_map, armor_card)
 
 def render_shield_page(
     df_shields: pd.DataFrame,
@@ -220,178 +84,9 @@ def render_shield_page(
 
     tier_map = TIER_NAME_SETS[tier_set]
 
-    # -----------------------------
-    # Converter nome -> nível
-    # -----------------------------
-    name_to_level = {v: k for k, v in tier_map.items()}
+    add_tier_levels(df, "shield_tier", tier_map)
 
-    df["tier_level"] = (
-        df["shield_tier"]
-        .astype(str)
-        .str.strip()
-        .map(name_to_level)
-    )
-
-    df["tier_level"] = pd.Categorical(
-        df["tier_level"],
-        categories=TIER_ORDER,
-        ordered=True
-    )
-
-    # -----------------------------
-    # ordenar armaduras
-    # -----------------------------
-    order = (
-        df.groupby("shield_name")["shield_id"]
-        .min()
-        .sort_values()
-        .index
-    )
-
-    for shield_name in order:
-
-        df_shield = (
-            df[df["shield_name"] == shield_name]
-            .sort_values("tier_level")
-            .reset_index(drop=True)
-        )
-
-        with st.expander(shield_name):
-
-            tiers_available = [
-                int(t)
-                for t in df_shield["tier_level"]
-                .dropna()
-                .unique()
-            ]
-
-            tiers_available = sorted(tiers_available)
-
-            if not tiers_available:
-                st.warning("Sem tiers disponíveis")
-                continue
-
-            tier_labels = [tier_map[t] for t in tiers_available]
-
-            default_level = 1 if 1 in tiers_available else tiers_available[0]
-            default_label = tier_map[default_level]
-
-            # -----------------------------
-            # seleção de tier
-            # -----------------------------
-            try:
-                selected_label = st.segmented_control(
-                    "Tier",
-                    options=tier_labels,
-                    default=default_label,
-                    key=f"tier_segment_{shield_name}"
-                )
-            except Exception:
-                selected_label = st.radio(
-                    "Tier",
-                    options=tier_labels,
-                    index=tier_labels.index(default_label),
-                    horizontal=True,
-                    key=f"tier_radio_{shield_name}"
-                )
-
-            selected_level = name_to_level[selected_label]
-
-            # -----------------------------
-            # linha atual
-            # -----------------------------
-            row = df_shield[df_shield["tier_level"] == selected_level]
-
-            if row.empty:
-                continue
-
-            row = row.iloc[0]
-
-            # -----------------------------
-            # tier anterior
-            # -----------------------------
-            prev_row = None
-            idx = tiers_available.index(selected_level)
-
-            if idx > 0:
-                prev_level = tiers_available[idx - 1]
-                prev = df_shield[df_shield["tier_level"] == prev_level]
-
-                if not prev.empty:
-                    prev_row = prev.iloc[0]
-
-            tier_color = TIER_COLORS.get(selected_level, "#374151")
-
-            # -----------------------------
-            # highlight helper
-            # -----------------------------
-            def h(field):
-
-                if prev_row is None:
-                    value = row[field]
-
-                    if isinstance(value, (int, float)):
-                        return f"{float(value):.1f}"
-
-                    return str(value)
-
-                value = row[field]
-                prev = prev_row[field]
-
-                # textos longos → diff granular
-                if isinstance(value, str):
-                    return diff_text_granular(value, prev, tier_color)
-
-                # números → round + highlight
-                if isinstance(value, (int, float)):
-                    value_fmt = f"{float(value):.1f}"
-                    prev_fmt = f"{float(prev):.1f}" if isinstance(prev, (int, float)) else prev
-
-                    if value_fmt != prev_fmt:
-                        return f"<span style='color:{tier_color}; font-weight:600'>{value_fmt}</span>"
-
-                    return value_fmt
-
-                # fallback
-                if value != prev:
-                    return f"<span style='color:{tier_color}; font-weight:600'>{value}</span>"
-
-                return str(value)
-
-            # -----------------------------
-            # HEADER
-            # -----------------------------
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(
-                    f"**Tier:** <span style='color:{tier_color}; font-weight:700'>{tier_map[selected_level]}</span>",
-                    unsafe_allow_html=True
-                )
-
-            with col2:
-                st.markdown(f"**Tipo:** {h('shield_type')}", unsafe_allow_html=True)
-
-            # -----------------------------
-            # CAMPOS
-            # -----------------------------
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Pontos de Vida:** {h('shield_hit_points')}", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"**Resistência (DR):** {h('shield_damage_resistence')}", unsafe_allow_html=True)
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.markdown(f"**Preço:** {h('shield_price')} moedas", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"**Peso:** {h('shield_weight')} kg", unsafe_allow_html=True)
-
-            st.markdown(f"**Descrição:**\n\n{h('shield_description')}", unsafe_allow_html=True)
+    render_tiered_cards(df, "shield_name", "shield_id", "shield_tier", tier_map, shield_card)
 
 def render_armor_selection(df_armors: pd.DataFrame):
 
@@ -628,6 +323,21 @@ def armors(df_dict: dict) -> None:
 
     df = df_armors[df_armors["armor_piece_location"] == selection]
 
+    with st.expander("🎯 Filtros de Armaduras"):
+
+        filter_config = {
+            "Filtrar por Resistência a Dano (RD):": {
+                "column": "armor_damage_resistence",
+                "type": "range"
+            }
+        }
+
+        df, selected_filters = dynamic_filters(df, filter_config)
+
+        if df.empty:
+            st.warning("Nenhuma armadura encontrada com os filtros aplicados.")
+            return
+
     st.markdown("***")
 
     # Função de visualização
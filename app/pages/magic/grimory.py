@@ -9,7 +9,10 @@ warnings.simplefilter(action='ignore', category=UserWarning)
 
 # RELATIVE IMPORTS
 from app.src.data_loader import read_excel_data
-from app.components.filters import dynamic_filters, search_box
+from app.src.glossary import get_glossary_html
+from app.src.query_planner import Query
+from app.components.filters import dynamic_filters, search_box, full_text_search_box, run_query
+from app.components.pagination import render_window
 
 # ------------------------------------------------------------------------------------------------ #
 # CONSTANTES
@@ -54,7 +57,7 @@ def render_spell_requirements(req_string: str):
 def render_spell_list(df: pd.DataFrame):
     """
     Renderiza uma visão compacta dos feitiços.
-    Mostra apenas informações essenciais em formato de tabela.
+    Mostra apenas informações essenciais em formato de tabela, na ordem de `df`.
     """
     st.subheader("Lista Compacta")
 
@@ -62,55 +65,66 @@ def render_spell_list(df: pd.DataFrame):
         ["spell_id", "spell_name", "spell_tier", "spell_type", "spell_difficulty",
          "spell_cost", "spell_cast_time", "spell_range", "spell_target_type",
          "spell_effect_area", "spell_duration", "spell_school"]
-    ].sort_values("spell_id")
+    ]
 
     st.dataframe(compact_df, use_container_width=True)
 
+def render_spell_card(label, row: dict, descriptions: pd.Series, observations: pd.Series):
+    """
+    Renderiza a ficha completa de um feitiço (`row` é a linha como dicionário).
+    """
+    col1, col2, col3 = st.columns(3)
+    with col1: st.write(f"**ID:** {row['spell_id']}")
+    with col2: st.write(f"**Nome:** {row['spell_name']}")
+    with col3: st.write(f"**Duração:** {row['spell_duration']}")
+
+    col1, col2, col3 = st.columns(3)
+    with col1: st.write(f"**Tier:** {row['spell_tier']}")
+    with col2: st.write(f"**Tipo:** {row['spell_type']}")
+    with col3: st.write(f"**Dificuldade:** {row['spell_difficulty']}")
+
+    col1, col2, col3 = st.columns(3)
+    with col1: st.write(f"**Alcance:** {row['spell_range']}")
+    with col2: st.write(f"**Alvo:** {row['spell_target_type']}")
+    with col3: st.write(f"**Área:** {row['spell_effect_area']}")
+
+    # Custo de Mana
+    st.write(f"**Custo de Mana:** {row['spell_cost']}")
+
+    # Descrição e Observações
+    col1, col2 = st.columns(2)
+    with col1: st.markdown(f"**Descrição:**\n\n{descriptions[label]}", unsafe_allow_html=True)
+    with col2: st.markdown(f"**Observação:**\n\n{observations[label]}", unsafe_allow_html=True)
+
+    # --------------------------- Requirements ----------------------------- #
+    st.markdown("**Requisitos:**")
+    req_list = render_spell_requirements(row["spell_requirements"])
+    if req_list:
+        for r in req_list:
+            st.write(f"- {r}")
+    else:
+        st.write("- Nenhum")
+
+    st.markdown("---")
+
 def render_spell_full(df: pd.DataFrame):
     """
     Renderiza cada feitiço em modo detalhado (ficha completa),
     com todos os campos e layout visual expandido.
+
+    Apenas a página atual de fichas é renderizada (`render_window`), na ordem de `df` (id, ou
+    relevância quando há termo de busca: `run_query` já entrega ordenado).
     """
-    df_sorted = df.sort_values(by="spell_id")
+    # Descrições com o glossário marcado (HTML gerado uma vez por versão dos dados)
+    descriptions = get_glossary_html(df, "spell_description")
+    observations = get_glossary_html(df, "spell_observation")
 
     st.subheader("Ficha Completa")
 
-    for _, row in df_sorted.iterrows():
-
-        col1, col2, col3 = st.columns(3)
-        with col1: st.write(f"**ID:** {row['spell_id']}")
-        with col2: st.write(f"**Nome:** {row['spell_name']}")
-        with col3: st.write(f"**Duração:** {row['spell_duration']}")
-
-        col1, col2, col3 = st.columns(3)
-        with col1: st.write(f"**Tier:** {row['spell_tier']}")
-        with col2: st.write(f"**Tipo:** {row['spell_type']}")
-        with col3: st.write(f"**Dificuldade:** {row['spell_difficulty']}")
-
-        col1, col2, col3 = st.columns(3)
-        with col1: st.write(f"**Alcance:** {row['spell_range']}")
-        with col2: st.write(f"**Alvo:** {row['spell_target_type']}")
-        with col3: st.write(f"**Área:** {row['spell_effect_area']}")
-
-        # Custo de Mana
-        st.write(f"**Custo de Mana:** {row['spell_cost']}")
-
-        # Descrição e Observações
-        col1, col2 = st.columns(2)
-        with col1: st.markdown(f"**Descrição:**\n\n{row['spell_description']}")
-        with col2: st.markdown(f"**Observação:**\n\n{row['spell_observation']}")
-
-        # --------------------------- Requirements ----------------------------- #
-        st.markdown("**Requisitos:**")
-        req_list = render_spell_requirements(row["spell_requirements"])
-        if req_list:
-            for r in req_list:
-                st.write(f"- {r}")
-        else:
-            st.write("- Nenhum")
-
-
-        st.markdown("---")
+    render_window(
+        df,
+        lambda label, row: render_spell_card(label, row, descriptions, observations),
+    )
 
 # ------------------------------------------------------------------------------------------------ #
 #   FUNÇÕES DE VISUALIZAÇÃO DO STREAMLIT
@@ -139,10 +153,22 @@ def grimory(df_dict: dict):
     # Filtros
     with st.expander("🎯 Filtros de Feitiços"):
 
-        df = search_box(
+        # Busca, filtros e ordenação preenchem uma única consulta, executada no final
+        query = Query(df)
+
+        search_box(
             df=df,
             label="🔍 Busca de Feitiços",
-            column="spell_name"
+            column="spell_name",
+            incremental=True,
+            query=query
+        )
+
+        full_text_search_box(
+            df=df,
+            label="📜 Busca nas Descrições",
+            column="spell_name",
+            query=query
         )
 
         filter_config = {
@@ -162,10 +188,25 @@ def grimory(df_dict: dict):
                 "type": "multiselect",
                 "default": [],
                 "sort_order": ["F", "M", "D", "MD"]
+            },
+            "Filtrar por Custo de Mana:": {
+                "column": "spell_cost",
+                "type": "range"
+            },
+            "Filtrar por Requisitos:": {
+                "column": "spell_requirements",
+                "type": "tags",
+                "default": []
             }
         }
 
-        df, selected_filters = dynamic_filters(df, filter_config)
+        dynamic_filters(df, filter_config, query=query)
+
+        # com termo de busca, o resultado fica na ordem de relevância
+        if not query.ranked:
+            query.set_sort("spell_id")
+
+        df = run_query(query)
 
         if df.empty:
             st.warning("Nenhum feitiço encontrado com os filtros aplicados.")
@@ -3,6 +3,7 @@
 # IMPORT
 import os
 import logging
+import threading
 import pandas as pd
 from r4ven_utils.log4me import r4venLogManager
 
@@ -15,6 +16,11 @@ from utils import get_project_folder
 logs_folder = get_project_folder('app')
 data_folder = get_project_folder('data')
 
+# Registro, por processo, das abas carregadas: (arquivo, aba) -> DataFrame original.
+# É a partir dele que os índices de busca e filtro são construídos uma vez por versão dos dados.
+_SHEET_REGISTRY = {}
+_SHEET_REGISTRY_LOCK = threading.Lock()
+
 # ------------------------------------------------------------------------------------------------ #
 # FUNÇÕES UTILITÁRIAS PARA MANIPULAÇÃO DE TABELAS
 
@@ -25,6 +31,62 @@ def filter_sheet_names(sheet_list: list, exclude_list: list) -> list:
     """
     return [s for s in sheet_list if s not in exclude_list]
 
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES DE VERSIONAMENTO DOS DADOS
+
+def get_data_version(file_path: str) -> str:
+    """
+    Retorna uma assinatura da versão de um arquivo de dados.
+    A assinatura muda sempre que o arquivo é regravado (data de modificação + tamanho).
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return ""
+
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+def get_frame_key(df: pd.DataFrame):
+    """
+    Retorna a chave (arquivo, aba, versão) gravada em `df.attrs` por `read_excel_data`.
+    Retorna None quando o DataFrame não veio do carregador de dados.
+    """
+    attrs = getattr(df, "attrs", None) or {}
+
+    try:
+        return attrs["file_name"], attrs["sheet_name"], attrs["data_version"]
+    except KeyError:
+        return None
+
+def register_sheet(file_name: str, sheet_name: str, data_version: str, df: pd.DataFrame) -> None:
+    """
+    Marca o DataFrame com sua origem/versão e o guarda no registro de abas.
+    """
+    df.attrs.update({
+        "file_name": file_name,
+        "sheet_name": sheet_name,
+        "data_version": data_version,
+    })
+
+    with _SHEET_REGISTRY_LOCK:
+        _SHEET_REGISTRY[(file_name, sheet_name)] = df
+
+def get_registered_sheet(file_name: str, sheet_name: str, data_version: str = None):
+    """
+    Retorna a aba completa registrada para (arquivo, aba).
+    Se `data_version` for informado e não corresponder ao registro, retorna None.
+    """
+    with _SHEET_REGISTRY_LOCK:
+        df = _SHEET_REGISTRY.get((file_name, sheet_name))
+
+    if df is None:
+        return None
+
+    if data_version is not None and df.attrs.get("data_version") != data_version:
+        return None
+
+    return df
+
 
 # ------------------------------------------------------------------------------------------------ #
 # CLASSE PARA LEITURA DE EXCEL
@@ -149,4 +211,10 @@ def read_excel_data(file_name: str) -> dict:
         log4me.error("Falha ao carregar as abas selecionada.")
         return
 
+    # Marca cada aba com sua versão para que os índices sejam reaproveitados entre reruns
+    data_version = get_data_version(file_path)
+
+    for sheet_name, df in df_dict.items():
+        register_sheet(file_name, sheet_name, data_version, df)
+
     return df_dict
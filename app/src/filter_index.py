@@ -0,0 +1,349 @@
+"""
+Script que contém o índice de bitmaps usado pelos filtros das páginas.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import numpy as np
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.src.data_loader import get_frame_key, get_registered_sheet
+from app.src.index_cache import get_sheet_index
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+_WORD_BITS = 64
+
+# Colunas de listas ("Corte, Perfuração"): separador e caracteres removidos das pontas das tags
+_TAG_SEPARATOR = ","
+_TAG_STRIP = " []"
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES DE BITSET
+
+def _n_words(n_rows: int) -> int:
+    return (n_rows + _WORD_BITS - 1) // _WORD_BITS
+
+def _bits(rows: np.ndarray) -> np.ndarray:
+    return np.left_shift(np.uint64(1), (rows % _WORD_BITS).astype(np.uint64))
+
+def positions_to_bitset(positions: np.ndarray, n_rows: int) -> np.ndarray:
+    """ Bitset (uint64 empacotado) com as posições ligadas. """
+    words = np.zeros(_n_words(n_rows), dtype=np.uint64)
+    positions = np.asarray(positions, dtype=np.int64)
+    np.bitwise_or.at(words, positions // _WORD_BITS, _bits(positions))
+    return words
+
+def bitset_to_mask(words: np.ndarray, n_rows: int) -> np.ndarray:
+    """ Converte o bitset de volta para uma máscara booleana de `n_rows` posições. """
+    as_bytes = words.astype("<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, bitorder="little")[:n_rows].astype(bool)
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSE DO ÍNDICE DE BITMAPS
+
+class ColumnBitmaps:
+    """
+    Um bitmap (bitset uint64 empacotado) por valor distinto de uma coluna da aba.
+
+    `bitmaps[i]` tem ligados os bits das linhas cujo valor é `values[i]` (nulos ficam de fora).
+    Filtros viram operações AND/OR sobre bitsets de `ceil(linhas / 64)` palavras, sem criar
+    DataFrames intermediários.
+    """
+
+    def __init__(self, df: pd.DataFrame, column: str):
+        self.column = column
+        self.labels = df.index.to_numpy()
+        self.n_rows = len(df)
+
+        codes, uniques = pd.factorize(df[column])
+
+        self.codes = codes
+        self.values = list(uniques)
+        self.value_ids = {value: i for i, value in enumerate(self.values)}
+
+        rows = np.flatnonzero(codes >= 0)
+        self.bitmaps = np.zeros((len(self.values), _n_words(self.n_rows)), dtype=np.uint64)
+        np.bitwise_or.at(self.bitmaps, (codes[rows], rows // _WORD_BITS), _bits(rows))
+
+    def __len__(self):
+        return len(self.values)
+
+    def select(self, values: list) -> np.ndarray:
+        """ Bitset das linhas com qualquer um dos valores (OR dos bitmaps). """
+        ids = [self.value_ids[v] for v in values if v in self.value_ids]
+
+        if not ids:
+            return np.zeros(self.bitmaps.shape[1], dtype=np.uint64)
+
+        return np.bitwise_or.reduce(self.bitmaps[ids], axis=0)
+
+    def select_mask(self, values: list) -> np.ndarray:
+        """ Máscara booleana (por linha) das linhas com qualquer um dos valores. """
+        return bitset_to_mask(self.select(values), self.n_rows)
+
+    def present_values(self, bitset: np.ndarray) -> list:
+        """ Valores que aparecem em pelo menos uma linha do bitset. """
+        present = (self.bitmaps & bitset).any(axis=1)
+        return [v for v, p in zip(self.values, present) if p]
+
+    def value_codes(self, rows: np.ndarray) -> np.ndarray:
+        """ Códigos dos valores das linhas da máscara (usado nas contagens das facetas). """
+        return self.codes[rows & (self.codes >= 0)]
+
+class TagIndex:
+    """
+    Índice das colunas com listas separadas por vírgula (ex.: "Corte, Perfuração").
+
+    As listas são explodidas uma vez por versão dos dados em CSR: as tags da linha `i` são
+    `values[tag_codes[offsets[i]:offsets[i + 1]]]`. Cada tag também tem seu bitmap de linhas,
+    então "qualquer uma" é a união (OR) dos bitmaps das tags escolhidas e "todas" a interseção
+    (AND), sem varrer os textos.
+    """
+
+    def __init__(self, df: pd.DataFrame, column: str):
+        self.column = column
+        self.labels = df.index.to_numpy()
+        self.n_rows = len(df)
+
+        # cada texto distinto é quebrado uma única vez
+        codes, uniques = pd.factorize(df[column])
+        unique_tags = [split_tags(v) for v in uniques]
+        row_tags = [unique_tags[c] if c >= 0 else [] for c in codes]
+
+        lengths = np.fromiter((len(t) for t in row_tags), dtype=np.int64, count=self.n_rows)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        flat = pd.Series([t for tags in row_tags for t in tags], dtype=object)
+        self.tag_codes, tags = pd.factorize(flat)
+        self.tag_rows = np.repeat(np.arange(self.n_rows), lengths)
+
+        self.values = list(tags)
+        self.value_ids = {value: i for i, value in enumerate(self.values)}
+
+        self.bitmaps = np.zeros((len(self.values), _n_words(self.n_rows)), dtype=np.uint64)
+        np.bitwise_or.at(
+            self.bitmaps, (self.tag_codes, self.tag_rows // _WORD_BITS), _bits(self.tag_rows)
+        )
+
+    def __len__(self):
+        return len(self.values)
+
+    def row_tags(self, position: int) -> list:
+        """ Tags da linha (posição na aba). """
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return [self.values[c] for c in self.tag_codes[start:end]]
+
+    def select(self, values: list, mode: str = "any") -> np.ndarray:
+        """ Bitset das linhas com qualquer uma ("any") ou todas ("all") as tags. """
+        ids = [self.value_ids[v] for v in values if v in self.value_ids]
+
+        if not ids or (mode == "all" and len(ids) < len(set(values))):
+            return np.zeros(self.bitmaps.shape[1], dtype=np.uint64)
+
+        if mode == "all":
+            return np.bitwise_and.reduce(self.bitmaps[ids], axis=0)
+
+        return np.bitwise_or.reduce(self.bitmaps[ids], axis=0)
+
+    def select_mask(self, selection: tuple) -> np.ndarray:
+        """ Máscara booleana (por linha) para a seleção (modo, tags). """
+        mode, values = selection
+        return bitset_to_mask(self.select(values, mode), self.n_rows)
+
+    def present_values(self, bitset: np.ndarray) -> list:
+        """ Tags que aparecem em pelo menos uma linha do bitset. """
+        present = (self.bitmaps & bitset).any(axis=1)
+        return [v for v, p in zip(self.values, present) if p]
+
+    def value_codes(self, rows: np.ndarray) -> np.ndarray:
+        """ Códigos das tags das linhas da máscara (uma entrada por par linha/tag). """
+        return self.tag_codes[rows[self.tag_rows]]
+
+class NumericColumnIndex:
+    """
+    Índice pré-ordenado de uma coluna numérica, para filtros de intervalo.
+
+    `order` são as linhas com valor numérico (textos e nulos ficam de fora) ordenadas pelo
+    valor, e `sorted_values` os valores nessa ordem. Um intervalo [mín, máx] é respondido com
+    dois `np.searchsorted` e a fatia `order[início:fim]`, sem comparar a coluna inteira.
+    """
+
+    def __init__(self, df: pd.DataFrame, column: str):
+        self.column = column
+        self.labels = df.index.to_numpy()
+        self.n_rows = len(df)
+
+        values = pd.to_numeric(df[column], errors="coerce")
+        values = np.asarray(values.to_numpy(dtype=float, na_value=np.nan))
+
+        valid = np.flatnonzero(~np.isnan(values))
+
+        self.order = valid[np.argsort(values[valid], kind="stable")]
+        self.sorted_values = values[self.order]
+        self.is_integer = bool(np.all(self.sorted_values == np.round(self.sorted_values)))
+
+    def __len__(self):
+        return len(self.order)
+
+    def bounds(self, universe: np.ndarray):
+        """ (mínimo, máximo) da coluna entre as linhas da máscara; None se não há valores. """
+        inside = np.flatnonzero(universe[self.order])
+
+        if not inside.size:
+            return None
+
+        low, high = self.sorted_values[inside[0]], self.sorted_values[inside[-1]]
+
+        if self.is_integer:
+            return int(low), int(high)
+
+        return float(low), float(high)
+
+    def select_mask(self, selection: tuple) -> np.ndarray:
+        """ Máscara booleana (por linha) das linhas com valor em [mín, máx]. """
+        low, high = selection
+
+        start = np.searchsorted(self.sorted_values, low, side="left")
+        end = np.searchsorted(self.sorted_values, high, side="right")
+
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.order[start:end]] = True
+
+        return mask
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def split_tags(value) -> list:
+    """ Tags de um texto separado por vírgulas ("[A, B]" → ["A", "B"]); nulos viram lista vazia. """
+    if not isinstance(value, str):
+        if pd.isna(value):
+            return []
+        value = str(value)
+
+    tags = (t.strip(_TAG_STRIP) for t in value.split(_TAG_SEPARATOR))
+    return [t for t in tags if t]
+
+def get_filter_bitmaps(
+    df: pd.DataFrame,
+    columns: list,
+    range_columns: list = (),
+    tag_columns: list = (),
+) -> dict:
+    """
+    Retorna {coluna: índice} para as colunas de filtro, todos sobre as mesmas linhas:
+    ColumnBitmaps para filtros de valores, NumericColumnIndex para as `range_columns` e
+    TagIndex para as `tag_columns`.
+
+    Se `df` é (um subconjunto de) uma aba registrada que tem todas as colunas, os índices são os
+    da aba completa, construídos uma vez por versão dos dados. Caso contrário (aba não registrada
+    ou coluna criada pela página), são construídos na hora sobre o próprio `df`.
+    """
+    frame_key = get_frame_key(df)
+    full_df = get_registered_sheet(*frame_key) if frame_key else None
+    registered = full_df is not None and all(c in full_df.columns for c in columns)
+
+    indexes = {}
+
+    for c in columns:
+        if c in range_columns:
+            builder, kind = NumericColumnIndex, "range"
+        elif c in tag_columns:
+            builder, kind = TagIndex, "tags"
+        else:
+            builder, kind = ColumnBitmaps, "bitmap"
+
+        indexes[c] = get_sheet_index(df, kind, builder, c) if registered else builder(df, c)
+
+    return indexes
+
+def rows_bitset(bitmaps: ColumnBitmaps, df: pd.DataFrame):
+    """
+    Retorna (posições das linhas de `df` no índice, bitset dessas linhas): o universo inicial
+    dos filtros quando `df` é um subconjunto da aba (categoria, busca etc.).
+    """
+    positions = pd.Index(bitmaps.labels).get_indexer(df.index)
+    return positions, positions_to_bitset(positions[positions >= 0], bitmaps.n_rows)
+
+def selected_rows(mask: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """
+    Posições (em `df`, na ordem de `df`) das linhas ligadas na máscara do índice, onde
+    `positions` é o mapeamento devolvido por `rows_bitset`. É o único passo que toca o
+    DataFrame: o chamador materializa com um único `df.take(...)`.
+    """
+    return np.flatnonzero((positions >= 0) & mask[positions])
+
+def facet_counts(facets: list, selections: list, universe: np.ndarray):
+    """
+    Contagem de cada valor de cada filtro (faceta), considerando as seleções das demais.
+    Facetas de intervalo (NumericColumnIndex) restringem as demais, mas não têm contagens.
+    Nas facetas de tags (TagIndex) cada linha conta uma vez para cada tag; no modo "todas",
+    a própria seleção também vale para as contagens (refinamento), não só as das demais.
+
+    A contagem de um valor da faceta `f` é o número de linhas do universo com esse valor que
+    passam em todas as outras facetas. Cada linha conta para as facetas se não falha em
+    nenhuma seleção ou, se falha em exatamente uma, só para a faceta em que falhou. Todas as
+    contagens saem de um único `np.bincount` sobre os códigos (deslocados por faceta), então o
+    custo é O(linhas) por faceta, sem groupby.
+
+    Args:
+        facets : list
+            Lista de ColumnBitmaps/NumericColumnIndex (todos sobre as mesmas linhas).
+
+        selections : list
+            Valores selecionados em cada faceta, (mín, máx) nas de intervalo ou
+            (modo, tags) nas de tags (vazio = sem filtro).
+
+        universe : np.ndarray
+            Máscara booleana das linhas consideradas.
+
+    Return:
+        counts : list
+            Para cada faceta, um array com a contagem de cada valor de `facet.values`
+            (None nas facetas de intervalo).
+
+        matched : np.ndarray
+            Máscara das linhas que passam em todas as seleções.
+    """
+    fails = np.zeros(universe.size, dtype=np.int64)
+    failed_facet = np.full(universe.size, -1, dtype=np.int64)
+
+    for f, (facet, selection) in enumerate(zip(facets, selections)):
+        if not selection:
+            continue
+
+        failed = universe & ~facet.select_mask(selection)
+        fails += failed
+        failed_facet[failed] = f
+
+    matched = universe & (fails == 0)
+    almost = universe & (fails == 1)
+
+    countable = [isinstance(facet, (ColumnBitmaps, TagIndex)) for facet in facets]
+    sizes = [len(facet) if c else 0 for facet, c in zip(facets, countable)]
+    offsets = np.cumsum([0] + sizes)
+    keys = [np.zeros(0, dtype=np.int64)]
+
+    for f, (facet, selection) in enumerate(zip(facets, selections)):
+        if not countable[f]:
+            continue
+
+        if isinstance(facet, TagIndex) and selection and selection[0] == "all":
+            rows = matched
+        else:
+            rows = matched | (almost & (failed_facet == f))
+
+        keys.append(facet.value_codes(rows) + offsets[f])
+
+    counts = np.bincount(np.concatenate(keys), minlength=offsets[-1])
+
+    counts = [
+        counts[offsets[f]:offsets[f + 1]] if countable[f] else None
+        for f in range(len(facets))
+    ]
+
+    return counts, matched
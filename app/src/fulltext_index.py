@@ -0,0 +1,255 @@
+"""
+Script que contém os índices invertidos usados na busca textual: BM25 nas descrições e a
+busca ponderada em várias colunas.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+from bisect import bisect_left
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.src.index_cache import get_sheet_index
+from app.src.text_processing import tokenize, normalize_series, stem_tokens, query_stems
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+# Parâmetros clássicos do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Colunas de texto longo indexadas além de *_description e *_observation
+EXTRA_TEXT_COLUMNS = ["consumable_effect"]
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES AUXILIARES
+
+def get_text_columns(df: pd.DataFrame) -> list:
+    """
+    Retorna as colunas de texto longo de uma aba (*_description, *_observation e extras).
+    """
+    return [
+        c for c in df.columns
+        if str(c).endswith("_description")
+        or str(c).endswith("_observation")
+        or c in EXTRA_TEXT_COLUMNS
+    ]
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSE DO ÍNDICE INVERTIDO
+
+class FullTextIndex:
+    """
+    Índice invertido sobre as colunas de texto longo de uma aba, com ranqueamento BM25.
+
+    As listas de postagem ficam em arrays compactos no formato CSR:
+    - `offsets[t]:offsets[t + 1]` delimita as postagens do termo `t`;
+    - `doc_ids` guarda a posição da linha de cada postagem;
+    - `weights` guarda a parte do BM25 que depende só da linha (tf e tamanho do documento).
+
+    Na consulta, apenas as postagens dos termos buscados são lidas: o score de cada linha é
+    `idf[t] * weights` somado por linha, sem nenhuma varredura do texto original.
+
+    Os termos indexados são radicais (`stem`), calculados na construção; na consulta só as
+    palavras buscadas são reduzidas ("poções" encontra "poção", "envenenar" encontra "veneno").
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list = None, k1: float = BM25_K1, b: float = BM25_B):
+        columns = get_text_columns(df) if columns is None else columns
+
+        self.columns = columns
+        self.labels = df.index.to_numpy()
+
+        n_docs = len(df)
+        vocabulary = {}
+        term_ids, doc_ids, tfs = [], [], []
+        doc_len = np.zeros(n_docs, dtype=np.float32)
+
+        if columns:
+            texts = normalize_series(df[columns].fillna("").astype(str).agg(" ".join, axis=1))
+        else:
+            texts = [""] * n_docs
+
+        for doc, text in enumerate(texts):
+            counts = Counter(stem_tokens(tokenize(text, normalized=True)))
+            doc_len[doc] = sum(counts.values())
+
+            for term, tf in counts.items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                doc_ids.append(doc)
+                tfs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int32)
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        tfs = np.asarray(tfs, dtype=np.float32)
+
+        # Ordena as postagens por termo (estável, mantendo as linhas em ordem crescente)
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, doc_ids, tfs = term_ids[order], doc_ids[order], tfs[order]
+
+        n_terms = len(vocabulary)
+        doc_freq = np.bincount(term_ids, minlength=n_terms).astype(np.float32)
+
+        avgdl = float(doc_len.mean()) if n_docs and doc_len.sum() else 1.0
+        norm = k1 * (1.0 - b + b * doc_len[doc_ids] / avgdl)
+
+        self.vocabulary = vocabulary
+        self.offsets = np.concatenate(([0], np.cumsum(doc_freq))).astype(np.int64)
+        self.doc_ids = doc_ids
+        self.weights = (tfs * (k1 + 1.0) / (tfs + norm)).astype(np.float32)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def search(self, query: str):
+        """
+        Retorna (rótulos, scores) das linhas que contêm ao menos um termo da busca,
+        em ordem decrescente de score BM25.
+        """
+        stems = [s for token in tokenize(query) for s in query_stems(token)]
+        terms = [self.vocabulary[s] for s in dict.fromkeys(stems) if s in self.vocabulary]
+
+        if not terms:
+            return self.labels[:0], np.zeros(0, dtype=np.float32)
+
+        docs = np.concatenate([self.doc_ids[self.offsets[t]:self.offsets[t + 1]] for t in terms])
+        contributions = np.concatenate([
+            self.idf[t] * self.weights[self.offsets[t]:self.offsets[t + 1]] for t in terms
+        ])
+
+        matched, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions).astype(np.float32)
+
+        order = np.argsort(-scores, kind="stable")
+        return self.labels[matched[order]], scores[order]
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSE DO ÍNDICE PONDERADO DE VÁRIAS COLUNAS
+
+class _PostingLists:
+    """
+    Listas de postagem em CSR com o vocabulário ordenado: todos os termos que começam por um
+    prefixo ocupam um intervalo contíguo (encontrado com `bisect`), e suas postagens formam uma
+    única fatia de `doc_ids`/`weights`.
+    """
+
+    def __init__(self, postings: dict, n_docs: int):
+        self.terms = sorted(postings)
+
+        doc_freq = np.asarray([len(postings[t]) for t in self.terms], dtype=np.float64)
+        idf = np.log1p(n_docs / doc_freq) if len(doc_freq) else doc_freq
+
+        self.offsets = np.concatenate(([0], np.cumsum(doc_freq))).astype(np.int64)
+        self.doc_ids = np.fromiter(
+            (doc for t in self.terms for doc in postings[t]), dtype=np.int64, count=int(self.offsets[-1])
+        )
+        self.weights = np.fromiter(
+            (w for t in self.terms for w in postings[t].values()), dtype=np.float64, count=int(self.offsets[-1])
+        )
+        self.weights *= np.repeat(idf, doc_freq.astype(np.int64))
+
+    def _range(self, term: str, prefix: bool):
+        lo = bisect_left(self.terms, term)
+
+        if prefix:
+            hi = bisect_left(self.terms, term + "\U0010ffff", lo)
+        else:
+            hi = lo + 1 if lo < len(self.terms) and self.terms[lo] == term else lo
+
+        return self.offsets[lo], self.offsets[hi]
+
+    def scores(self, term: str, n_docs: int, prefix: bool = False) -> np.ndarray:
+        """ Score de cada linha para o termo (ou para todos os termos com esse prefixo). """
+        start, end = self._range(term, prefix)
+        return np.bincount(self.doc_ids[start:end], weights=self.weights[start:end], minlength=n_docs)
+
+class WeightedFieldIndex:
+    """
+    Índice invertido único sobre várias colunas de uma aba, cada uma com um peso
+    (ex.: nome ×3, tipo ×2, descrição ×1).
+
+    Os pesos são aplicados na construção: a postagem (termo, linha) guarda
+    `idf[termo] * Σ peso_coluna * tf_coluna`, então a consulta lê uma única lista de postagens
+    por termo, não importa quantas colunas foram indexadas.
+
+    Há duas listas: a das palavras, consultada por prefixo ("cur" → "cura", "curativas"), e a dos
+    radicais (`stem`), consultada pelo radical da palavra buscada ("poções" → "poção"). O score de
+    cada palavra é o maior dos dois, e uma linha só entra no resultado se casar com todas as
+    palavras da busca.
+    """
+
+    def __init__(self, df: pd.DataFrame, fields):
+        fields = dict(fields)
+
+        self.fields = fields
+        self.labels = df.index.to_numpy()
+
+        n_docs = len(df)
+        words, stems = {}, {}
+
+        for column, weight in fields.items():
+            if column not in df.columns:
+                continue
+
+            for doc, text in enumerate(normalize_series(df[column])):
+                tokens = tokenize(text, normalized=True)
+
+                for postings, terms in ((words, tokens), (stems, stem_tokens(tokens))):
+                    for term, tf in Counter(terms).items():
+                        doc_weights = postings.setdefault(term, {})
+                        doc_weights[doc] = doc_weights.get(doc, 0.0) + weight * tf
+
+        self.words = _PostingLists(words, n_docs)
+        self.stems = _PostingLists(stems, n_docs)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def search(self, query: str):
+        """
+        Retorna (posições, scores) das linhas que casam com todas as palavras da busca
+        (por prefixo ou por radical), em ordem decrescente de score.
+        """
+        n_docs = len(self.labels)
+        tokens = list(dict.fromkeys(tokenize(query)))
+
+        if not tokens or not n_docs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        total = np.zeros(n_docs)
+        matched = np.ones(n_docs, dtype=bool)
+
+        for token in tokens:
+            token_scores = self.words.scores(token, n_docs, prefix=True)
+
+            for root in query_stems(token):
+                token_scores = np.maximum(token_scores, self.stems.scores(root, n_docs))
+
+            matched &= token_scores > 0
+            total += token_scores
+
+        positions = np.flatnonzero(matched)
+        order = np.argsort(-total[positions], kind="stable")
+
+        return positions[order], total[positions[order]]
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def get_fulltext_index(df: pd.DataFrame) -> FullTextIndex:
+    """
+    Retorna o índice BM25 da aba de `df`, construído uma vez por versão dos dados.
+    """
+    return get_sheet_index(df, "fulltext", FullTextIndex)
+
+def get_field_index(df: pd.DataFrame, fields: dict) -> WeightedFieldIndex:
+    """
+    Retorna o índice ponderado das colunas `fields` ({coluna: peso}) da aba de `df`,
+    construído uma vez por versão dos dados (e por conjunto de pesos).
+    """
+    return get_sheet_index(df, "fields", WeightedFieldIndex, tuple(fields.items()))
@@ -0,0 +1,204 @@
+"""
+Script que contém o glossário de regras (siglas e perícias) destacado nas descrições.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import os
+from collections import deque
+from html import escape
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.utils import GLOSSARY_TERMS, GLOSSARY_SKILL_TITLE
+from app.src.data_loader import read_excel_data, get_data_version, data_folder
+from app.src.index_cache import index_cache, get_sheet_index
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+GLOSSARY_SKILLS_FILE = "skills.xlsx"
+
+# Nomes de perícia com estes caracteres são agrupadores ("MONTARIA | CAVALOS"), não termos
+_SKILL_NAME_SEPARATORS = ("|", "/")
+_MIN_SKILL_NAME_LENGTH = 4
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSES
+
+class AhoCorasick:
+    """
+    Autômato de Aho-Corasick: encontra todas as ocorrências de um conjunto de padrões em um
+    texto com uma única passada, independente de quantos padrões existem.
+    """
+
+    def __init__(self, patterns: list):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][char] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = child
+            self.output[node].append(pattern_id)
+
+        # links de falha em largura (os filhos da raiz falham para a raiz)
+        queue = deque(self.goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+
+            for char, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+                queue.append(child)
+
+    def iter_matches(self, text: str):
+        """ Gera (posição final, id do padrão) de cada ocorrência no texto. """
+        node = 0
+
+        for position, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+
+            node = self.goto[node].get(char, 0)
+
+            for pattern_id in self.output[node]:
+                yield position, pattern_id
+
+class GlossaryLinker:
+    """
+    Marca os termos do glossário em um texto com `<abbr title="...">`, exibido como dica
+    (tooltip) ao passar o mouse.
+
+    Cada termo é (texto, dica, diferencia_maiúsculas). O autômato roda sobre o texto em
+    minúsculas; siglas só valem na forma exata (ST, não "st") e todo termo precisa ser uma
+    palavra inteira. Ocorrências sobrepostas são resolvidas pela mais à esquerda e mais longa.
+    """
+
+    def __init__(self, terms: list):
+        self.terms = terms
+        self.automaton = AhoCorasick([t.lower() for t, _, _ in terms])
+
+    def __len__(self):
+        return len(self.terms)
+
+    def annotate(self, text) -> str:
+        """
+        Retorna o texto com os termos do glossário envolvidos em `<abbr>`. O texto da célula é
+        escapado (`<`, `>`, `&`) antes de virar HTML, inclusive o termo dentro de cada `<abbr>`.
+        """
+        if text is None or pd.isna(text):
+            return ""
+
+        text = str(text)
+        lowered = text.lower()
+
+        # alguns caracteres mudam de tamanho no lower(); nesse caso, só troca os demais
+        if len(lowered) != len(text):
+            lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+        matches = []
+
+        for end, term_id in self.automaton.iter_matches(lowered):
+            term, _, case_sensitive = self.terms[term_id]
+            start = end - len(term) + 1
+            end += 1
+
+            if case_sensitive and text[start:end] != term:
+                continue
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+
+            matches.append((start, -end, term_id))
+
+        if not matches:
+            return escape(text, quote=False)
+
+        pieces = []
+        position = 0
+
+        for start, end, term_id in sorted(matches):
+            end = -end
+            if start < position:
+                continue
+
+            title = escape(self.terms[term_id][1], quote=True)
+            pieces.append(escape(text[position:start], quote=False))
+            pieces.append(f'<abbr title="{title}">{escape(text[start:end], quote=False)}</abbr>')
+            position = end
+
+        pieces.append(escape(text[position:], quote=False))
+
+        return "".join(pieces)
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def _build_glossary_terms() -> list:
+    """ Siglas de `GLOSSARY_TERMS` + nomes de perícia do catálogo. """
+    terms = [(term, title, True) for term, title in GLOSSARY_TERMS.items()]
+
+    for df in (read_excel_data(GLOSSARY_SKILLS_FILE) or {}).values():
+        if "skill_name" not in df.columns:
+            continue
+
+        skills = df.dropna(subset=["skill_name"]).drop_duplicates("skill_name")
+
+        for _, row in skills.iterrows():
+            name = str(row["skill_name"]).strip()
+
+            if len(name) < _MIN_SKILL_NAME_LENGTH or any(s in name for s in _SKILL_NAME_SEPARATORS):
+                continue
+
+            title = GLOSSARY_SKILL_TITLE.format(
+                category=row.get("skill_category", ""),
+                type="Mental" if row.get("skill_type") == "M" else "Física",
+                difficulty=row.get("skill_difficulty", ""),
+            )
+            terms.append((name, title, False))
+
+    return terms
+
+def get_glossary_version() -> str:
+    """ Versão do glossário (a do arquivo de perícias, de onde vêm os nomes). """
+    return get_data_version(os.path.join(data_folder, GLOSSARY_SKILLS_FILE))
+
+def get_glossary_linker() -> GlossaryLinker:
+    """
+    Retorna o marcador do glossário, com o autômato reconstruído apenas quando o arquivo de
+    perícias muda.
+    """
+    return index_cache.get_or_build(
+        ("glossary",),
+        get_glossary_version(),
+        lambda: GlossaryLinker(_build_glossary_terms()),
+    )
+
+def _annotate_column(df: pd.DataFrame, column: str, glossary_version: str) -> pd.Series:
+    linker = get_glossary_linker()
+    return pd.Series([linker.annotate(t) for t in df[column]], index=df.index, dtype=object)
+
+def get_glossary_html(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    Retorna o HTML (com os termos do glossário marcados) de cada linha da coluna, indexado
+    pelos rótulos da aba. É gerado uma única vez por versão da aba e do glossário; na
+    renderização basta ler `get_glossary_html(df, coluna)[rótulo]`.
+    """
+    return get_sheet_index(df, "glossary_html", _annotate_column, column, get_glossary_version())
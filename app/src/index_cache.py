@@ -0,0 +1,90 @@
+"""
+Script que contém o cache de índices construídos uma vez por versão dos dados.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import threading
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.src.data_loader import get_frame_key, get_registered_sheet
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSE DE CACHE VERSIONADO
+
+class VersionedIndexCache:
+    """
+    Cache, por processo, de estruturas derivadas dos dados (índices de busca, bitmaps etc.).
+
+    Cada escopo guarda apenas a versão mais recente: quando a planilha é regravada a versão muda,
+    o índice é reconstruído e o anterior é descartado automaticamente.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, scope: tuple, version, builder):
+        """
+        Retorna o valor do escopo para a versão informada, construindo-o com `builder()` se necessário.
+        """
+        with self._lock:
+            entry = self._entries.get(scope)
+
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        value = builder()
+
+        with self._lock:
+            self._entries[scope] = (version, value)
+
+        return value
+
+    def clear(self) -> None:
+        """ Remove todos os índices do cache. """
+        with self._lock:
+            self._entries.clear()
+
+index_cache = VersionedIndexCache()
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def get_sheet_index(df: pd.DataFrame, kind: str, builder, *params):
+    """
+    Retorna o índice `kind` da aba de origem de `df`, construído sobre a aba completa.
+
+    Os índices trabalham com os rótulos de linha (df.index) da aba original, então o mesmo índice
+    atende qualquer subconjunto da aba (categoria, filtros etc.). Quando `df` não veio de
+    `read_excel_data`, o índice é construído sobre o próprio `df`, sem cache.
+
+    Parâmetros
+    ----------
+    df : pd.DataFrame
+        DataFrame (ou subconjunto) da aba.
+    kind : str
+        Nome do tipo de índice, usado na chave do cache.
+    builder : callable
+        Função `builder(df_completo, *params)` que constrói o índice.
+    *params
+        Parâmetros extras do índice (coluna, pesos...). Devem ser hasheáveis.
+    """
+    frame_key = get_frame_key(df)
+
+    if frame_key is None:
+        return builder(df, *params)
+
+    file_name, sheet_name, data_version = frame_key
+    full_df = get_registered_sheet(file_name, sheet_name, data_version)
+
+    if full_df is None:
+        return builder(df, *params)
+
+    return index_cache.get_or_build(
+        (kind, file_name, sheet_name) + tuple(params),
+        data_version,
+        lambda: builder(full_df, *params),
+    )
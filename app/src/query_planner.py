@@ -0,0 +1,464 @@
+"""
+Script que contém o planejador de consultas das páginas: busca, filtros e ordenação descritos
+em um único objeto e executados de uma vez sobre os índices em cache da aba.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import time
+import hashlib
+import numpy as np
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.src.data_loader import get_frame_key, get_registered_sheet
+from app.src.filter_index import get_filter_bitmaps, selected_rows
+from app.src.fulltext_index import get_field_index, get_fulltext_index
+from app.src.search_index import get_name_index, get_symspell_index
+from app.src.sort_index import sorted_rows
+from app.src.text_processing import normalize_text, tokenize
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+# Custo relativo de cada tipo de passo: os mais baratos rodam primeiro e reduzem as candidatas
+# dos seguintes (bitmaps antes da busca nas descrições, que vem antes da pontuação por nome)
+STEP_COSTS = {
+    "facet": 1,
+    "tags": 1,
+    "range": 2,
+    "text": 3,
+    "search": 4,
+}
+
+STEP_LABELS = {
+    "facet": "faceta",
+    "tags": "tags",
+    "range": "intervalo",
+    "text": "descrições",
+    "search": "busca",
+}
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSES
+
+class Query:
+    """
+    Consulta de uma aba, preenchida pelos componentes de filtro (`search_box`,
+    `full_text_search_box`, `dynamic_filters`, `sort_ui` com `query=...`):
+
+    - search: busca por nome (termo, coluna, distância de edição, campos ponderados, modo
+      incremental);
+    - text: busca BM25 nas descrições;
+    - facets: {coluna: valores selecionados};
+    - tags: {coluna: (modo "any"/"all", tags selecionadas)};
+    - ranges: {coluna: (mín, máx)};
+    - sort: (coluna, crescente).
+
+    `df` é o universo da consulta (a aba ou um subconjunto dela, ex.: uma categoria). Em
+    `feedback` os componentes guardam os espaços da interface que só são preenchidos depois da
+    execução (sugestões da busca, mais relevantes etc.).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.search = None
+        self.text = None
+        self.facets = {}
+        self.tags = {}
+        self.ranges = {}
+        self.sort = None
+        self.feedback = {}
+
+        # passo → (máscara, extras) calculados sobre o universo inteiro (reaproveitados)
+        self._matches = {}
+
+    def set_search(
+        self,
+        term: str,
+        column: str,
+        norm_column: str = "_search_norm",
+        max_edit_distance: int = 2,
+        max_suggestions: int = 20,
+        fields: dict = None,
+        incremental: bool = False,
+    ) -> None:
+        self.search = {
+            "term": normalize_text(term),
+            "column": column,
+            "norm_column": norm_column,
+            "max_edit_distance": max_edit_distance,
+            "max_suggestions": max_suggestions,
+            "fields": tuple(fields.items()) if fields else None,
+            "incremental": incremental,
+        }
+
+    def set_text(self, term: str) -> None:
+        self.text = {"term": term}
+
+    def add_facet(self, column: str, values: list) -> None:
+        if values:
+            self.facets[column] = list(values)
+
+    def add_tags(self, column: str, selection: tuple) -> None:
+        if selection:
+            mode, values = selection
+            self.tags[column] = (mode, list(values))
+
+    def add_range(self, column: str, bounds: tuple) -> None:
+        if bounds:
+            self.ranges[column] = tuple(bounds)
+
+    def set_sort(self, column: str, ascending: bool = True) -> None:
+        self.sort = (column, ascending)
+
+    @property
+    def ranked(self) -> bool:
+        """ Há termo de busca (por nome ou nas descrições): sem `sort`, o resultado sai por relevância. """
+        return bool(self.search and self.search["term"]) or bool(self.text and self.text["term"].strip())
+
+class QueryPlan:
+    """
+    Plano de execução de uma `Query`.
+
+    Todos os passos trabalham com máscaras booleanas sobre as linhas da aba completa (o mesmo
+    espaço de posições dos índices em cache). Cada passo recebe as candidatas restantes e
+    devolve as que passam; os passos rodam em ordem de custo (`STEP_COSTS`), e os já
+    calculados sobre o universo inteiro (ex.: para as contagens das facetas) são reaproveitados.
+    Só o resultado final é materializado, com um único `take`, já na ordem pedida.
+    """
+
+    def __init__(self, query: Query):
+        self.query = query
+
+        df = query.df
+        frame_key = get_frame_key(df)
+        full_df = get_registered_sheet(*frame_key) if frame_key else None
+
+        # espaço de posições dos índices: a aba completa (ou o próprio df, se não registrado)
+        self.space = full_df if full_df is not None else df
+        self.positions = self.space.index.get_indexer(df.index)
+
+        self.steps = sorted(self._build_steps(), key=lambda step: STEP_COSTS[step[0]])
+
+        # cache da sessão durante `execute` (estado da busca incremental)
+        self._cache = None
+
+        # prefixo das chaves no cache da sessão: (arquivo, aba, versão, linhas de `df` na aba)
+        self.cache_prefix = None
+        if full_df is not None:
+            self.cache_prefix = frame_key + (rows_digest(self.positions),)
+
+    def _build_steps(self) -> list:
+        query = self.query
+        steps = [("facet", column) for column in query.facets]
+        steps += [("tags", column) for column in query.tags]
+        steps += [("range", column) for column in query.ranges]
+
+        if query.text:
+            steps.append(("text", query.text["term"]))
+
+        if query.search and query.search["term"]:
+            steps.append(("search", query.search["term"]))
+
+        return steps
+
+    def _step_key(self, step: tuple) -> tuple:
+        kind, name = step
+        query = self.query
+
+        if kind == "facet":
+            return step + (tuple(query.facets[name]),)
+        if kind == "tags":
+            mode, values = query.tags[name]
+            return step + (mode, tuple(values))
+        if kind == "range":
+            return step + (query.ranges[name],)
+        if kind == "search":
+            return step + tuple(sorted(query.search.items()))
+
+        return step
+
+    def result_key(self, kinds: tuple = None, materialize: bool = True) -> tuple:
+        """ Chave do resultado da consulta (passos com seus parâmetros e ordenação). """
+        steps = tuple(self._step_key(s) for s in self.steps if kinds is None or s[0] in kinds)
+        order = self.query.sort if materialize else None
+
+        return self.cache_prefix + ("result", kinds, steps, order, materialize)
+
+    def universe(self) -> np.ndarray:
+        """ Máscara das linhas de `query.df` no espaço da aba. """
+        mask = np.zeros(len(self.space), dtype=bool)
+        mask[self.positions[self.positions >= 0]] = True
+        return mask
+
+    def explain(self) -> list:
+        """ Descrição dos passos, na ordem em que vão rodar. """
+        return [f"{STEP_LABELS[kind]} {name!r}" for kind, name in self.steps]
+
+    # -------------------------------------------------------------------------------------------- #
+    # PASSOS
+
+    def _run_facet(self, column: str, candidates: np.ndarray):
+        index = self._filter_index(column)
+        return candidates & index.select_mask(self.query.facets[column]), {}
+
+    def _run_tags(self, column: str, candidates: np.ndarray):
+        index = self._filter_index(column, kind="tags")
+        return candidates & index.select_mask(self.query.tags[column]), {}
+
+    def _run_range(self, column: str, candidates: np.ndarray):
+        index = self._filter_index(column, kind="range")
+        return candidates & index.select_mask(self.query.ranges[column]), {}
+
+    def _filter_index(self, column: str, kind: str = "facet"):
+        index = get_filter_bitmaps(
+            self.query.df,
+            [column],
+            range_columns=[column] if kind == "range" else [],
+            tag_columns=[column] if kind == "tags" else [],
+        )[column]
+
+        if index.n_rows != len(self.space):
+            raise ValueError(f"Coluna {column!r} não existe na aba de origem.")
+
+        return index
+
+    def _run_text(self, term: str, candidates: np.ndarray):
+        labels, _ = get_fulltext_index(self.query.df).search(term)
+        ranked = self.space.index.get_indexer(labels)
+        ranked = ranked[ranked >= 0]
+        ranked = ranked[candidates[ranked]]
+
+        mask = np.zeros(len(self.space), dtype=bool)
+        mask[ranked] = True
+
+        return mask, {"ranking": ranked}
+
+    def _run_search(self, term: str, candidates: np.ndarray):
+        search = self.query.search
+        df = self.query.df
+        names = get_name_index(df, search["column"], search["norm_column"])
+        speller = get_symspell_index(df, search["column"], search["norm_column"], search["max_edit_distance"])
+
+        # Termo só com stopwords/pontuação: sem palavras para o índice ponderado, usa o nome
+        if search["fields"] and tokenize(term, normalized=True):
+            positions, scores = get_field_index(df, dict(search["fields"])).search(term)
+            keep = candidates[positions]
+            positions, scores = positions[keep], scores[keep]
+            literal = len(positions) > 0
+            extras = {"ranking": positions}
+
+        else:
+            previous = self._previous_search(term, candidates)
+            scan = previous if previous is not None else np.flatnonzero(candidates)
+
+            positions, scores = speller.match(term, positions=scan)
+            keep = candidates[positions]
+            positions, scores = positions[keep], scores[keep]
+            literal = bool((scores >= 1.0).any())
+
+            # maior score primeiro; empates na ordem da aba
+            extras = {"ranking": positions[np.argsort(-scores, kind="stable")]}
+
+            self._store_search(term, candidates, positions)
+
+        mask = np.zeros(len(self.space), dtype=bool)
+        mask[positions] = True
+
+        extras["suggestions"] = names.top_names(positions, scores, search["max_suggestions"])
+        extras["correction"] = None if literal else speller.correct(term, rows=candidates)
+
+        return mask, extras
+
+    def _search_state_key(self, candidates: np.ndarray) -> tuple:
+        """ Chave do estado incremental: coluna da busca + linhas candidatas (cada conjunto tem o seu). """
+        search = self.query.search
+        return self.cache_prefix + (
+            "search_state", search["column"], search["norm_column"], search["max_edit_distance"],
+            rows_digest(np.flatnonzero(candidates)),
+        )
+
+    def _previous_search(self, term: str, candidates: np.ndarray):
+        """
+        Modo incremental: linhas encontradas pela busca anterior sobre as mesmas candidatas, se o
+        novo termo a estende ("espa" → "espad"); senão None (a varredura considera todas elas).
+        """
+        if not self.query.search["incremental"] or self._cache is None:
+            return None
+
+        state = self._cache.get(self._search_state_key(candidates))
+
+        if state is None or not term.startswith(state["term"]):
+            return None
+
+        return state["positions"]
+
+    def _store_search(self, term: str, candidates: np.ndarray, positions: np.ndarray) -> None:
+        if self.query.search["incremental"] and self._cache is not None:
+            self._cache.put(self._search_state_key(candidates), {"term": term, "positions": positions})
+
+    # -------------------------------------------------------------------------------------------- #
+    # EXECUÇÃO
+
+    def execute(self, kinds: tuple = None, materialize: bool = True, cache=None) -> dict:
+        """
+        Executa os passos (apenas os de `kinds`, se informado) e retorna:
+
+        - mask: máscara final no espaço da aba;
+        - frame: o DataFrame resultante, na ordem pedida (se `materialize`);
+        - report: [{passo, linhas antes, linhas depois, ms, reaproveitado}] na ordem executada;
+        - extras: informações de cada tipo de passo (sugestões, correção, ranking...).
+
+        Com `cache` (um `SearchResultCache` da sessão), o resultado fica guardado pela chave
+        (aba, versão, linhas de `df`, passos, ordenação): a mesma consulta em outra execução
+        da página só refaz o `take` final. As máscaras de cada passo também ficam no cache, de
+        modo que mudar um filtro não refaz a busca. Com a busca em modo incremental, o termo
+        anterior e suas linhas também ficam no cache: quando o novo termo o estende, só essas
+        linhas passam de novo pela varredura por substring.
+        """
+        if self.cache_prefix is None:
+            cache = None
+
+        self._cache = cache
+
+        key = self.result_key(kinds, materialize) if cache is not None else None
+        hit = cache.get(key) if key is not None else None
+
+        if hit is not None:
+            return self._cached_result(hit, materialize)
+
+        universe = self.universe()
+        mask = universe.copy()
+        report, extras = [], {}
+
+        steps = [s for s in self.steps if kinds is None or s[0] in kinds]
+
+        # passos já calculados sobre o universo não custam nada: vão primeiro
+        if cache is not None:
+            for step in steps:
+                step_key = self._step_key(step)
+
+                if step_key not in self.query._matches:
+                    stored = cache.get(self.cache_prefix + step_key)
+
+                    if stored is not None:
+                        self.query._matches[step_key] = stored
+
+        steps.sort(key=lambda s: self._step_key(s) not in self.query._matches)
+
+        for step in steps:
+            kind, name = step
+            step_key = self._step_key(step)
+            rows_before = int(mask.sum())
+            start = time.perf_counter()
+
+            cached = step_key in self.query._matches
+
+            if cached:
+                step_mask, step_extras = self.query._matches[step_key]
+            else:
+                over_universe = rows_before == int(universe.sum())
+                step_mask, step_extras = getattr(self, f"_run_{kind}")(name, mask)
+
+                if over_universe:
+                    self.query._matches[step_key] = (step_mask, step_extras)
+
+                    if cache is not None:
+                        cache.put(self.cache_prefix + step_key, (step_mask, step_extras))
+
+            mask &= step_mask
+            extras[kind] = step_extras
+
+            report.append({
+                "step": f"{STEP_LABELS[kind]} {name!r}",
+                "rows_in": rows_before,
+                "rows_out": int(mask.sum()),
+                "ms": (time.perf_counter() - start) * 1000,
+                "cached": cached,
+            })
+
+        result = {"mask": mask, "report": report, "extras": extras, "frame": None}
+        rows = None
+
+        if materialize:
+            start = time.perf_counter()
+            rows = self._ordered_rows(mask, extras)
+            result["frame"] = self.query.df.take(rows)
+
+            report.append({
+                "step": "ordenação + take",
+                "rows_in": int(mask.sum()),
+                "rows_out": len(result["frame"]),
+                "ms": (time.perf_counter() - start) * 1000,
+                "cached": False,
+            })
+
+        if key is not None:
+            cache.put(key, {"mask": mask, "report": report, "extras": extras, "rows": rows})
+
+        return result
+
+    def _cached_result(self, hit: dict, materialize: bool) -> dict:
+        """ Resultado guardado no cache da sessão: só o `take` final é refeito. """
+        report = [dict(r, cached=True, ms=0.0) for r in hit["report"]]
+        result = {"mask": hit["mask"], "report": report, "extras": hit["extras"], "frame": None}
+
+        if materialize:
+            start = time.perf_counter()
+            result["frame"] = self.query.df.take(hit["rows"])
+            report[-1].update(cached=False, ms=(time.perf_counter() - start) * 1000)
+
+        return result
+
+    def _ordered_rows(self, mask: np.ndarray, extras: dict) -> np.ndarray:
+        """
+        Posições em `df` das linhas finais, para uma única `take`: pela chave de ordenação, se
+        houver; senão pelo ranking da busca nas descrições ou da busca por nome; senão na
+        ordem de `df`.
+        """
+        df = self.query.df
+        rows = selected_rows(mask, self.positions)
+
+        ranking = extras.get("text", {}).get("ranking")
+        if ranking is None:
+            ranking = extras.get("search", {}).get("ranking")
+
+        if self.query.sort:
+            column, ascending = self.query.sort
+            rows = sorted_rows(df, rows, column, ascending)
+
+        elif ranking is not None:
+            # posição em `df` de cada linha da aba
+            frame_positions = np.full(len(self.space), -1, dtype=np.int64)
+            found = self.positions >= 0
+            frame_positions[self.positions[found]] = np.flatnonzero(found)
+
+            rows = frame_positions[ranking[mask[ranking]]]
+            rows = rows[rows >= 0]
+
+        return rows
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def rows_digest(positions: np.ndarray) -> str:
+    """ Resumo (hash) de um vetor de posições, considerando a ordem. """
+    positions = np.ascontiguousarray(positions, dtype=np.int64)
+    return hashlib.blake2b(positions.tobytes(), digest_size=16).hexdigest()
+
+def labels_digest(labels) -> str:
+    """ Resumo (hash) de rótulos de linha de qualquer tipo (ex.: `df.index`), considerando a ordem. """
+    return rows_digest(pd.util.hash_array(np.asarray(labels)).view(np.int64))
+
+def format_report(report: list) -> str:
+    """ Resumo de uma linha do plano executado (passo linhas_antes→linhas_depois · tempo). """
+    parts = [
+        f"{r['step']} {r['rows_in']}→{r['rows_out']} · "
+        + ("cache" if r["cached"] else f"{r['ms']:.2f} ms")
+        for r in report
+    ]
+    total = sum(r["ms"] for r in report)
+
+    return " → ".join(parts) + f" (total {total:.2f} ms)"
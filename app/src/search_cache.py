@@ -0,0 +1,114 @@
+"""
+Script que contém o cache LRU, compartilhado pelo processo, dos resultados de busca.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import threading
+from collections import OrderedDict
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSE DO CACHE
+
+class SearchResultCache:
+    """
+    Cache LRU de resultados de busca, compartilhado por todas as sessões do processo.
+
+    A chave deve começar por (arquivo, aba, versão dos dados); o restante identifica a busca
+    (coluna, termo normalizado, parâmetros de fuzzy...). Sempre que uma nova versão de uma aba
+    aparece, as entradas das versões anteriores dessa aba são descartadas.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _check_version(self, key: tuple) -> None:
+        """ Descarta as entradas da aba se a versão da chave for nova (chamar com o lock). """
+        sheet, version = key[:2], key[2]
+
+        if self._versions.get(sheet) == version:
+            return
+
+        if sheet in self._versions:
+            stale = [k for k in self._entries if k[:2] == sheet]
+            for k in stale:
+                del self._entries[k]
+
+        self._versions[sheet] = version
+
+    def get(self, key: tuple):
+        """ Retorna o valor da chave (ou None), atualizando as métricas de acerto. """
+        with self._lock:
+            self._check_version(key)
+            value = self._entries.get(key)
+
+            if value is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value) -> None:
+        """ Guarda o valor, removendo as entradas menos usadas se o limite for excedido. """
+        with self._lock:
+            self._check_version(key)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, file_name: str = None, sheet_name: str = None) -> None:
+        """ Remove as entradas de um arquivo/aba (ou todas, sem argumentos). """
+        with self._lock:
+            stale = [
+                k for k in self._entries
+                if (file_name is None or k[0] == file_name) and (sheet_name is None or k[1] == sheet_name)
+            ]
+            for k in stale:
+                del self._entries[k]
+
+    def stats(self) -> dict:
+        """ Retorna as métricas do cache (acertos, falhas, taxa de acerto, tamanho). """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def format_stats(label: str, stats: dict) -> str:
+    """ Resumo de uma linha das métricas de um cache (`SearchResultCache.stats()`). """
+    lookups = stats["hits"] + stats["misses"]
+
+    return (
+        f"{label}: {stats['hit_rate']:.0%} de acerto ({stats['hits']}/{lookups}) · "
+        f"{stats['size']}/{stats['max_entries']} entradas · {stats['evictions']} descartadas"
+    )
+
+# ------------------------------------------------------------------------------------------------ #
+# INSTÂNCIA COMPARTILHADA
+
+search_result_cache = SearchResultCache()
@@ -0,0 +1,716 @@
+"""
+Script que contém os índices de busca por nome usados pelos componentes de busca.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import os
+from bisect import bisect_left
+from difflib import SequenceMatcher
+import numpy as np
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.src.data_loader import read_excel_data, get_data_version, data_folder
+from app.src.index_cache import index_cache, get_sheet_index
+from app.src.text_processing import normalize_text, normalize_series, tokenize, stem_tokens, query_stems
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+# Arquivos e colunas de nome que compõem a busca global
+GLOBAL_SEARCH_SOURCES = {
+    "grimory.xlsx": ["spell_name"],
+    "skills.xlsx": ["skill_name"],
+    "weapons_with_tiers.xlsx": ["weapon_name"],
+    "armors.xlsx": ["armor_name", "shield_name"],
+    "alchemy.xlsx": ["consumable_name"],
+    "advantages_and_disadvantages.xlsx": ["advantage_name", "disadvantage_name"],
+}
+
+# Nome de exibição de cada catálogo (agrupamento dos resultados)
+CATALOG_LABELS = {
+    "spell_name": "Feitiços",
+    "skill_name": "Perícias",
+    "weapon_name": "Armas",
+    "armor_name": "Armaduras",
+    "shield_name": "Escudos",
+    "consumable_name": "Consumíveis",
+    "advantage_name": "Vantagens",
+    "disadvantage_name": "Desvantagens",
+}
+
+# Pontuação base por tipo de correspondência (fuzzy fica sempre abaixo de 1)
+_SCORE_EXACT = 4.0
+_SCORE_PREFIX = 3.0
+_SCORE_WORD_PREFIX = 2.0
+_SCORE_SUBSTRING = 1.0
+
+# Casamento só pelo radical das palavras: abaixo de qualquer substring, acima dos erros de digitação
+_SCORE_STEM = 1.0
+
+_SEPARATOR = "\x00"
+
+# Maior caractere Unicode: `prefixo + _MAX_CHAR` delimita o fim do intervalo do prefixo
+_MAX_CHAR = "\U0010ffff"
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES AUXILIARES
+
+def _substring_score(norm: str, query: str, offset: int) -> float:
+    """ Pontuação de uma ocorrência de `query` em `norm` na posição `offset`. """
+    if norm == query:
+        base = _SCORE_EXACT
+    elif offset == 0:
+        base = _SCORE_PREFIX
+    elif norm[offset - 1] == " ":
+        base = _SCORE_WORD_PREFIX
+    else:
+        base = _SCORE_SUBSTRING
+
+    # nomes mais curtos (mais próximos do termo) ficam na frente
+    return base + len(query) / len(norm)
+
+def _substring_scores(norms: np.ndarray, query: str) -> np.ndarray:
+    """
+    Versão vetorizada de `_substring_score` para um array de nomes normalizados (`np.char`):
+    pontuação da primeira ocorrência de `query` em cada nome (0 onde não ocorre).
+    """
+    scores = np.zeros(len(norms))
+
+    if not query or not len(norms):
+        return scores
+
+    offsets = np.char.find(norms, query)
+    lengths = np.char.str_len(norms)
+    hit = (offsets >= 0) & (lengths > 0)
+
+    base = np.full(len(norms), _SCORE_SUBSTRING)
+
+    inner = hit & (offsets > 0)
+    if inner.any():
+        word = np.zeros(len(norms), dtype=bool)
+        word[inner] = np.char.startswith(norms[inner], " ", offsets[inner] - 1)
+        base[word] = _SCORE_WORD_PREFIX
+
+    base[hit & (offsets == 0)] = _SCORE_PREFIX
+    base[hit & (offsets == 0) & (lengths == len(query))] = _SCORE_EXACT
+
+    scores[hit] = base[hit] + len(query) / lengths[hit]
+
+    return scores
+
+def _min_by_row(rows: np.ndarray, distances: np.ndarray):
+    """ Linhas distintas (ordenadas) e a menor distância de cada uma. """
+    order = np.lexsort((distances, rows))
+    rows, distances = rows[order], distances[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    return rows[first], distances[first]
+
+def _deletes(word: str, max_distance: int) -> set:
+    """ Todas as variações de `word` com até `max_distance` caracteres removidos (incluindo ela). """
+    found = {word}
+    frontier = {word}
+
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+
+    return found
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Distância de Damerau-Levenshtein (alinhamento ótimo: inserção, remoção, troca e transposição
+    de vizinhos), interrompida assim que passa de `max_distance` (retorna `max_distance + 1`).
+    """
+    if a == b:
+        return 0
+
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+
+            current[j] = value
+
+        if min(current) > max_distance:
+            return max_distance + 1
+
+        previous2, previous = previous, current
+
+    return min(previous[-1], max_distance + 1)
+
+def _allowed_distance(word: str, max_distance: int) -> int:
+    """ Erros tolerados pelo tamanho do termo: nenhum até 3 letras, 1 até 5 letras, 2 acima. """
+    if len(word) <= 3:
+        return 0
+
+    return min(max_distance, 1 if len(word) <= 5 else 2)
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSES DOS ÍNDICES DE UMA ABA
+
+class NameIndex:
+    """
+    Nomes (originais e normalizados) de uma coluna de uma aba, alinhados aos rótulos de linha.
+
+    As buscas retornam posições neste índice; `labels[posições]` dá os rótulos das linhas na aba.
+    """
+
+    def __init__(self, df: pd.DataFrame, column: str, norm_column: str = "_search_norm"):
+        self.column = column
+        self.labels = df.index.to_numpy()
+        self.names = df[column].to_numpy(dtype=object)
+
+        if norm_column in df.columns:
+            norms = df[norm_column]
+        else:
+            norms = normalize_series(df[column])
+
+        self.norms = norms.to_numpy(dtype=object)
+
+        # Mesmos nomes como array de texto do numpy, para a varredura vetorizada (`np.char`)
+        self.norm_text = norms.fillna("").astype(str).to_numpy(dtype=str)
+
+        # Código de cada nome distinto (-1 para nulos), usado para deduplicar as sugestões
+        self.name_codes, self.name_uniques = pd.factorize(self.names)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def top_names(self, positions: np.ndarray, scores: np.ndarray, k: int) -> list:
+        """
+        Os `k` nomes distintos de maior score entre as posições (usado nas sugestões).
+
+        Não ordena todas as linhas: o melhor score de cada nome é agregado pelo código do
+        `pd.factorize` (`np.maximum.at`) e os `k` melhores nomes são escolhidos com
+        `np.argpartition`; só eles são ordenados (O(n + k log k)). Empates ficam na ordem das linhas.
+        """
+        codes = self.name_codes[positions]
+        valid = codes >= 0
+
+        if k <= 0 or not valid.any():
+            return []
+
+        codes, scores, positions = codes[valid], scores[valid], positions[valid]
+
+        best = np.full(len(self.name_uniques), -np.inf)
+        np.maximum.at(best, codes, scores)
+
+        # primeira linha em que cada nome atinge o seu melhor score (desempate)
+        first = np.full(len(self.name_uniques), len(self), dtype=np.int64)
+        at_best = scores == best[codes]
+        np.minimum.at(first, codes[at_best], positions[at_best])
+
+        candidates = np.flatnonzero(np.isfinite(best))
+
+        if len(candidates) > k:
+            kth = best[candidates][np.argpartition(-best[candidates], k - 1)[k - 1]]
+            candidates = candidates[best[candidates] >= kth]
+
+        order = np.lexsort((first[candidates], -best[candidates]))[:k]
+
+        return [str(self.name_uniques[c]) for c in candidates[order]]
+
+class SymSpellIndex:
+    """
+    Dicionário de deleções (SymSpell) sobre os nomes de um `NameIndex`, para busca tolerante a
+    erros de digitação com distância de edição limitada (1 ou 2).
+
+    Os termos do dicionário são os nomes normalizados completos e cada uma de suas palavras.
+    Para cada termo são pré-computadas todas as variações com até `max_distance` letras removidas
+    (apenas dos `prefix_length` primeiros caracteres, o que limita o tamanho do dicionário).
+    Na consulta, basta gerar as deleções do termo buscado e consultar o dicionário: o número de
+    acessos depende só do tamanho do termo, não da quantidade de linhas. Os candidatos
+    encontrados são confirmados com a distância de Damerau-Levenshtein.
+
+    Também guarda os radicais (`stem`) das palavras de cada nome, calculados na construção, para
+    que variações de flexão casem sem custo extra na consulta ("poções" → "Poção de Mana").
+    """
+
+    def __init__(self, names: NameIndex, max_distance: int = 2, prefix_length: int = 7):
+        self.names = names
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        rows, stems = {}, {}
+        for position, norm in enumerate(names.norms):
+            if not norm:
+                continue
+            for term in {norm, *tokenize(norm, stopwords=frozenset(), normalized=True)}:
+                rows.setdefault(term, []).append(position)
+            for root in set(stem_tokens(tokenize(norm, normalized=True))):
+                stems.setdefault(root, []).append(position)
+
+        # radicais das palavras de cada nome ("pocoes" e "pocao" → "poca"), para a busca por radical
+        self.stem_rows = {root: np.asarray(p, dtype=np.int64) for root, p in stems.items()}
+
+        self.terms = list(rows)
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        self.term_rows = [np.asarray(p, dtype=np.int64) for p in rows.values()]
+
+        deletes = {}
+        for term_id, term in enumerate(self.terms):
+            for variant in _deletes(term[:prefix_length], max_distance):
+                deletes.setdefault(variant, []).append(term_id)
+
+        self._deletes = deletes
+
+    def __len__(self):
+        return len(self.terms)
+
+    def lookup(self, word: str, max_distance: int = None) -> list:
+        """
+        Termos do dicionário a até `max_distance` edições de `word` (por padrão, conforme o
+        tamanho da palavra), como (id do termo, distância), do mais próximo ao mais frequente.
+        """
+        if max_distance is None:
+            max_distance = _allowed_distance(word, self.max_distance)
+
+        max_distance = min(max_distance, self.max_distance)
+
+        seen = set()
+        hits = []
+
+        for variant in _deletes(word[:self.prefix_length], max_distance):
+            for term_id in self._deletes.get(variant, ()):
+                if term_id in seen:
+                    continue
+                seen.add(term_id)
+
+                distance = _edit_distance(word, self.terms[term_id], max_distance)
+                if distance <= max_distance:
+                    hits.append((term_id, distance))
+
+        return sorted(hits, key=lambda hit: (hit[1], -len(self.term_rows[hit[0]])))
+
+    def _distances(self, word: str, max_distance: int = None):
+        """
+        Linhas (ordenadas) com algum termo a até `max_distance` edições de `word` e a menor
+        distância de cada uma. Só toca nas linhas dos termos encontrados.
+        """
+        hits = self.lookup(word, max_distance)
+
+        if not hits:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # um só termo: as linhas dele já são ordenadas e distintas
+        if len(hits) == 1:
+            term_id, distance = hits[0]
+            return self.term_rows[term_id], np.full(len(self.term_rows[term_id]), float(distance))
+
+        rows = np.concatenate([self.term_rows[term_id] for term_id, _ in hits])
+        distances = np.concatenate([
+            np.full(len(self.term_rows[term_id]), distance, dtype=float) for term_id, distance in hits
+        ])
+
+        return _min_by_row(rows, distances)
+
+    def stem_matches(self, query_norm: str) -> np.ndarray:
+        """
+        Linhas (ordenadas) em que todas as palavras da busca casam pelo radical (só a consulta é
+        reduzida). Só toca nas linhas dos radicais encontrados.
+        """
+        tokens = tokenize(query_norm, normalized=True)
+        matches = None
+
+        for token in tokens:
+            roots = [self.stem_rows[root] for root in query_stems(token) if root in self.stem_rows]
+            if len(roots) == 1:
+                token_matches = roots[0]
+            else:
+                token_matches = np.unique(np.concatenate(roots)) if roots else np.empty(0, dtype=np.int64)
+
+            if matches is None:
+                matches = token_matches
+            else:
+                matches = np.intersect1d(matches, token_matches, assume_unique=True)
+
+        if matches is None:
+            return np.empty(0, dtype=np.int64)
+
+        return matches
+
+    def typo_distances(self, query_norm: str):
+        """
+        Linhas (ordenadas) próximas do termo e a distância de cada uma: o menor valor entre o
+        nome completo próximo do termo e, para termos com várias palavras, a soma das distâncias
+        quando todas as palavras casam.
+        """
+        rows, distances = self._distances(query_norm, _allowed_distance(query_norm, self.max_distance))
+
+        words = tokenize(query_norm, stopwords=frozenset(), normalized=True)
+
+        if len(words) > 1:
+            word_rows, total = self._distances(words[0])
+
+            for word in words[1:]:
+                next_rows, next_distances = self._distances(word)
+                word_rows, i, j = np.intersect1d(word_rows, next_rows, assume_unique=True, return_indices=True)
+                total = total[i] + next_distances[j]
+
+            rows, distances = _min_by_row(np.concatenate([rows, word_rows]), np.concatenate([distances, total]))
+
+        return rows, distances
+
+    def match(self, query_norm: str, positions: np.ndarray = None):
+        """
+        Busca híbrida (substring + radical + erros de digitação) do termo já normalizado.
+
+        Parâmetros
+        ----------
+        query_norm : str
+            Termo normalizado com `normalize_text`.
+        positions : np.ndarray
+            Posições candidatas para a varredura por substring (vetorizada); se None, considera
+            todas as linhas. Só essa parte é restrita: um termo mais longo só casa por substring
+            com linhas que já casavam com o termo anterior, mas não vale o mesmo para o radical
+            e os erros de digitação ("poco" → "pocoes"), então essas partes sempre vêm dos
+            dicionários inteiros (cujo custo independe do número de linhas).
+
+        Retorno
+        -------
+        tuple
+            (posições, scores) das linhas encontradas, na ordem das linhas (para ranquear, use
+            `NameIndex.top_names`). Casamentos por substring pontuam mais de 1, só pelo radical
+            das palavras exatamente 1 e só por erro de digitação abaixo de 1.
+        """
+        norms = self.names.norm_text
+
+        if positions is None:
+            positions = np.arange(len(norms), dtype=np.int64)
+        else:
+            positions = np.asarray(positions, dtype=np.int64)
+
+        substring_scores = _substring_scores(norms[positions], query_norm)
+        substring_found = substring_scores != 0
+        substring_rows = positions[substring_found]
+
+        stem_rows = self.stem_matches(query_norm)
+        typo_rows, distances = self.typo_distances(query_norm)
+
+        found = np.union1d(np.union1d(substring_rows, stem_rows), typo_rows)
+        scores = np.zeros(len(found))
+
+        # prioridade: substring > radical > erro de digitação (os de maior prioridade sobrescrevem)
+        scores[np.searchsorted(found, typo_rows)] = 1.0 - (distances + 1.0) / (len(query_norm) + 2.0)
+        scores[np.searchsorted(found, stem_rows)] = _SCORE_STEM
+        scores[np.searchsorted(found, substring_rows)] = substring_scores[substring_found]
+
+        return found, scores
+
+    def correct(self, query_norm: str, rows: np.ndarray = None):
+        """
+        Correção do termo ("você quis dizer...?"): cada palavra que não existe no dicionário é
+        trocada pelo termo mais próximo. Retorna None se não houver nada a corrigir.
+
+        Com `rows` (máscara das linhas exibidas, no espaço do índice), só valem os termos que
+        aparecem nessas linhas: a correção nunca aponta para um nome fora do subconjunto.
+        """
+        def present(term_id):
+            return rows is None or bool(rows[self.term_rows[term_id]].any())
+
+        words = tokenize(query_norm, stopwords=frozenset(), normalized=True)
+        corrected = []
+
+        for word in words:
+            term_id = self.term_ids.get(word)
+
+            if term_id is not None and present(term_id):
+                corrected.append(word)
+                continue
+
+            hits = [hit for hit in self.lookup(word) if present(hit[0])]
+            corrected.append(self.terms[hits[0][0]] if hits else word)
+
+        if corrected == words:
+            return None
+
+        return " ".join(corrected)
+
+class PrefixIndex:
+    """
+    Índice de prefixos para autocompletar os nomes de uma aba, sem tocar em DataFrames.
+
+    Guarda, em um array ordenado, cada nome normalizado distinto e também cada sufixo que começa
+    em uma palavra ("maos curativas" e "curativas"), junto do nome a que pertence. Um prefixo
+    corresponde a um intervalo contíguo desse array, encontrado com duas buscas binárias
+    (`bisect`). Os nomes são numerados na ordem do `*_id`, então as completações já saem
+    ordenadas por id.
+    """
+
+    def __init__(self, names: NameIndex, ids: pd.Series = None):
+        codes = names.name_codes
+        valid = codes >= 0
+        n_names = len(names.name_uniques)
+
+        if ids is None:
+            row_order = np.arange(len(names), dtype=np.float64)
+        else:
+            row_order = pd.to_numeric(ids, errors="coerce").to_numpy(dtype=np.float64)
+            row_order = np.where(np.isnan(row_order), np.inf, row_order)
+
+        # menor id de cada nome distinto → ordem dos nomes (empates pela primeira aparição)
+        name_order = np.full(n_names, np.inf)
+        np.minimum.at(name_order, codes[valid], row_order[valid])
+        by_id = np.argsort(name_order, kind="stable")
+
+        entry_of_code = np.empty(n_names, dtype=np.int64)
+        entry_of_code[by_id] = np.arange(n_names)
+
+        norm_of_code = np.empty(n_names, dtype=object)
+        norm_of_code[codes[valid]] = names.norms[valid]
+
+        self.names = [str(names.name_uniques[c]) for c in by_id]
+        self.norms = [str(norm_of_code[c]) for c in by_id]
+        self.entry_of_row = np.where(valid, entry_of_code[codes], -1)
+
+        keys = []
+        for entry, norm in enumerate(self.norms):
+            if not norm:
+                continue
+            keys.append((norm, entry))
+            keys.extend((norm[i + 1:], entry) for i, c in enumerate(norm) if c == " ")
+
+        keys.sort()
+
+        self.keys = [k for k, _ in keys]
+        self.key_entries = np.asarray([e for _, e in keys], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def allowed_entries(self, positions: np.ndarray) -> np.ndarray:
+        """ Máscara dos nomes presentes nas posições (para completar só o subconjunto exibido). """
+        allowed = np.zeros(len(self.names), dtype=bool)
+        entries = self.entry_of_row[positions]
+        allowed[entries[entries >= 0]] = True
+        return allowed
+
+    def complete(self, prefix_norm: str, k: int = 8, allowed: np.ndarray = None) -> list:
+        """
+        Até `k` nomes (originais) com uma palavra começando por `prefix_norm` (já normalizado),
+        em ordem de id. `allowed` restringe aos nomes marcados em `allowed_entries`.
+        """
+        if not prefix_norm or k <= 0:
+            return []
+
+        lo = bisect_left(self.keys, prefix_norm)
+        hi = bisect_left(self.keys, prefix_norm + _MAX_CHAR, lo)
+
+        entries = np.unique(self.key_entries[lo:hi])
+
+        if allowed is not None:
+            entries = entries[allowed[entries]]
+
+        return [self.names[e] for e in entries[:k]]
+
+def get_name_index(df: pd.DataFrame, column: str, norm_column: str = "_search_norm") -> NameIndex:
+    """
+    Retorna o índice de nomes da coluna, construído uma vez por versão dos dados.
+    """
+    return get_sheet_index(df, "names", NameIndex, column, norm_column)
+
+def _build_prefix_index(df: pd.DataFrame, column: str, norm_column: str, id_column: str) -> PrefixIndex:
+    ids = df[id_column] if id_column in df.columns else None
+    return PrefixIndex(get_name_index(df, column, norm_column), ids)
+
+def get_prefix_index(
+    df: pd.DataFrame,
+    column: str,
+    norm_column: str = "_search_norm",
+    id_column: str = None,
+) -> PrefixIndex:
+    """
+    Retorna o índice de autocompletar da coluna, construído uma vez por versão dos dados.
+    Por padrão, ordena pelo id correspondente ao nome (ex.: spell_name → spell_id).
+    """
+    if id_column is None:
+        id_column = column.removesuffix("_name") + "_id"
+
+    return get_sheet_index(df, "prefix", _build_prefix_index, column, norm_column, id_column)
+
+def _build_symspell_index(df: pd.DataFrame, column: str, norm_column: str, max_distance: int) -> SymSpellIndex:
+    return SymSpellIndex(get_name_index(df, column, norm_column), max_distance)
+
+def get_symspell_index(
+    df: pd.DataFrame,
+    column: str,
+    norm_column: str = "_search_norm",
+    max_distance: int = 2,
+) -> SymSpellIndex:
+    """
+    Retorna o dicionário de deleções da coluna, construído uma vez por versão dos dados
+    (reaproveitando o índice de nomes da mesma aba).
+    """
+    return get_sheet_index(df, "symspell", _build_symspell_index, column, norm_column, max_distance)
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSE DO ÍNDICE GLOBAL
+
+class GlobalSearchIndex:
+    """
+    Índice único sobre os nomes de todos os catálogos do Archivum.
+
+    Os nomes normalizados ficam concatenados em um único texto (separados por `\\x00`), de forma que
+    a busca por substring é feita com `str.find` sobre esse texto e cada ocorrência é mapeada de volta
+    para sua entrada com `np.searchsorted` sobre os offsets. O fuzzy (SequenceMatcher) só é calculado
+    para as entradas que não casaram por substring e que passam nos filtros rápidos de similaridade.
+    """
+
+    def __init__(self, entries: list):
+        """
+        Parâmetros
+        ----------
+        entries : list
+            Lista de tuplas (nome, nome_normalizado, catálogo, arquivo, aba).
+        """
+        self.names = [e[0] for e in entries]
+        self.norms = [e[1] for e in entries]
+        self.catalogs = [e[2] for e in entries]
+        self.files = [e[3] for e in entries]
+        self.sheets = [e[4] for e in entries]
+
+        starts = []
+        position = 0
+        for norm in self.norms:
+            starts.append(position)
+            position += len(norm) + len(_SEPARATOR)
+
+        self._starts = np.asarray(starts, dtype=np.int64)
+        self._blob = _SEPARATOR.join(self.norms)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _substring_scores(self, query: str) -> dict:
+        """ Retorna {entrada: pontuação} para todas as entradas que contêm `query`. """
+        scores = {}
+        blob = self._blob
+        position = blob.find(query)
+
+        while position != -1:
+            entry = int(np.searchsorted(self._starts, position, side="right")) - 1
+            norm = self.norms[entry]
+            offset = position - self._starts[entry]
+
+            score = _substring_score(norm, query, offset)
+            scores[entry] = max(score, scores.get(entry, 0.0))
+
+            # continua a partir da próxima entrada
+            next_entry = entry + 1
+            if next_entry >= len(self.norms):
+                break
+            position = blob.find(query, int(self._starts[next_entry]))
+
+        return scores
+
+    def _fuzzy_scores(self, query: str, threshold: float, skip: dict) -> dict:
+        """ Retorna {entrada: similaridade} para as entradas com similaridade >= threshold. """
+        scores = {}
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(query)
+
+        for entry, norm in enumerate(self.norms):
+            if entry in skip:
+                continue
+
+            matcher.set_seq1(norm)
+
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                scores[entry] = ratio
+
+        return scores
+
+    def search(self, query: str, fuzzy_threshold: float = 0.6, max_per_catalog: int = 5) -> list:
+        """
+        Busca `query` em todos os catálogos.
+
+        Retorno
+        -------
+        list
+            Lista de (catálogo, [resultado, ...]) ordenada pelo melhor resultado de cada catálogo.
+            Cada resultado é um dict com as chaves name, file, sheet e score.
+        """
+        query_norm = normalize_text(query)
+
+        if not query_norm:
+            return []
+
+        scores = self._substring_scores(query_norm)
+
+        if len(query_norm) >= 3:
+            scores.update(self._fuzzy_scores(query_norm, fuzzy_threshold, scores))
+
+        groups = {}
+        for entry in sorted(scores, key=lambda e: (-scores[e], self.norms[e])):
+            hits = groups.setdefault(self.catalogs[entry], [])
+            if len(hits) < max_per_catalog:
+                hits.append({
+                    "name": self.names[entry],
+                    "file": self.files[entry],
+                    "sheet": self.sheets[entry],
+                    "score": scores[entry],
+                })
+
+        return sorted(groups.items(), key=lambda item: -item[1][0]["score"])
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES DE CONSTRUÇÃO DO ÍNDICE GLOBAL
+
+def _build_global_entries() -> list:
+    """
+    Lê todos os catálogos e retorna as entradas únicas (por aba e catálogo) da busca global.
+    """
+    entries = []
+
+    for file_name, columns in GLOBAL_SEARCH_SOURCES.items():
+        df_dict = read_excel_data(file_name) or {}
+
+        for sheet_name, df in df_dict.items():
+            for column in columns:
+                if column not in df.columns:
+                    continue
+
+                names = df[column].dropna().astype(str)
+
+                seen = set()
+                for name, norm in zip(names, normalize_series(names)):
+                    if not norm or norm in seen:
+                        continue
+                    seen.add(norm)
+                    entries.append((name.strip(), norm, CATALOG_LABELS[column], file_name, sheet_name))
+
+    return entries
+
+def get_global_search_index() -> GlobalSearchIndex:
+    """
+    Retorna o índice global, reconstruído apenas quando algum dos arquivos de dados muda.
+    """
+    versions = tuple(
+        get_data_version(os.path.join(data_folder, file_name))
+        for file_name in GLOBAL_SEARCH_SOURCES
+    )
+
+    return index_cache.get_or_build(
+        ("global_search",),
+        versions,
+        lambda: GlobalSearchIndex(_build_global_entries()),
+    )
@@ -0,0 +1,96 @@
+"""
+Script que contém as permutações de ordenação (pré-calculadas por aba) usadas nas listagens.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import numpy as np
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.src.data_loader import get_frame_key, get_registered_sheet
+from app.src.index_cache import get_sheet_index
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSES
+
+class SortPermutation:
+    """
+    Permutação estável que ordena uma coluna da aba, calculada uma vez por versão dos dados.
+
+    `ascending` são as posições da aba em ordem crescente (nulos no final, como no
+    `sort_values`); `descending` é a parte não nula invertida, com os nulos ainda no final
+    (empates ficam na ordem inversa da aba).
+    """
+
+    def __init__(self, df: pd.DataFrame, column: str):
+        self.column = column
+        self.labels = df.index.to_numpy()
+        self.n_rows = len(df)
+
+        values = df[column].reset_index(drop=True)
+        self.ascending = values.sort_values(kind="stable", na_position="last").index.to_numpy()
+
+        n_valid = int(values.notna().sum())
+        self.has_nulls = n_valid < self.n_rows
+        self.descending = np.concatenate([self.ascending[:n_valid][::-1], self.ascending[n_valid:]])
+
+    def __len__(self):
+        return self.n_rows
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def _cached_permutation(df: pd.DataFrame, column: str):
+    """ Permutação em cache da coluna, ou None quando ela não pode ser usada para `df`. """
+    frame_key = get_frame_key(df)
+    full_df = get_registered_sheet(*frame_key) if frame_key else None
+
+    if full_df is None or column not in full_df.columns or not df.index.is_unique:
+        return None
+
+    try:
+        permutation = get_sheet_index(df, "sort", SortPermutation, column)
+    except TypeError:
+        # coluna com tipos misturados na aba completa (ex.: números e textos)
+        return None
+
+    return None if permutation.has_nulls else permutation
+
+def sorted_rows(df: pd.DataFrame, rows: np.ndarray, column: str, ascending: bool = True) -> np.ndarray:
+    """
+    Reordena as posições `rows` de `df` pela coluna, sem ordenar de novo: as linhas são
+    marcadas num mapa do tamanho da aba e lidas na ordem da permutação em cache.
+
+    Abas não registradas, colunas criadas pela página, colunas com nulos (as páginas costumam
+    aplicar `fillna('')`, o que muda a posição deles) ou índices repetidos caem na ordenação
+    normal das linhas.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    permutation = _cached_permutation(df, column)
+    sheet_positions = None
+
+    if permutation is not None:
+        sheet_positions = pd.Index(permutation.labels).get_indexer(df.index[rows])
+
+    if sheet_positions is None or (sheet_positions < 0).any():
+        values = df[column].take(rows).reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index
+        return rows[order.to_numpy()]
+
+    # posição em `df` de cada linha da aba (-1 = fora de `rows`)
+    frame_positions = np.full(permutation.n_rows, -1, dtype=np.int64)
+    frame_positions[sheet_positions] = rows
+
+    order = permutation.ascending if ascending else permutation.descending
+    order = frame_positions[order]
+
+    return order[order >= 0]
+
+def sort_frame(df: pd.DataFrame, column: str, ascending: bool = True) -> pd.DataFrame:
+    """
+    Equivalente a `df.sort_values(column, ascending=...)` para (subconjuntos de) abas
+    registradas, usando a permutação em cache (`sorted_rows`) e um único `take`.
+    """
+    return df.take(sorted_rows(df, np.arange(len(df)), column, ascending))
@@ -0,0 +1,187 @@
+"""
+Script que contém as funções de tratamento de texto usadas pela busca.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+import pandas as pd
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Stopwords do português já sem acentos (mesma forma produzida por `normalize_text`)
+PORTUGUESE_STOPWORDS = frozenset("""
+    a ao aos aquela aquelas aquele aqueles aquilo as ate com como contra da das de dela delas dele
+    deles depois do dos e ela elas ele eles em entre era eram essa essas esse esses esta estao estas
+    este estes eu foi foram ha isso isto ja la lhe lhes mais mas me mesmo meu meus minha minhas muito
+    na nas nem no nos nossa nossas nosso nossos num numa o os ou para pela pelas pelo pelos por qual
+    quando que quem se sem ser seu seus so sua suas tambem te tem tu tua tuas um uma umas uns voce
+    voces vos pode podem sao sera seja sobre apos cada outro outra outros outras todo toda todos todas
+""".split())
+
+# Regras do stemmer (estilo RSLP, já sem acentos): (sufixo, tamanho mínimo do radical, substituição).
+# Em cada etapa vale a primeira regra que casar, por isso os sufixos mais longos vêm antes.
+_PLURAL_RULES = [
+    ("oes", 3, "ao"), ("aes", 1, "ao"), ("ais", 1, "al"), ("eis", 2, "el"), ("ois", 1, "ol"),
+    ("les", 3, "l"), ("res", 3, "r"), ("ns", 1, "m"), ("is", 2, "il"), ("s", 2, ""),
+]
+
+_FEMININE_RULES = [
+    ("inha", 3, "inho"), ("iaca", 3, "iaco"), ("eira", 3, "eiro"), ("ona", 3, "ao"),
+    ("ora", 3, "or"), ("esa", 3, "es"), ("osa", 3, "oso"), ("ica", 3, "ico"), ("ada", 2, "ado"),
+    ("ida", 3, "ido"), ("ima", 3, "imo"), ("iva", 3, "ivo"), ("na", 4, "no"),
+]
+
+_AUGMENTATIVE_RULES = [
+    ("issimo", 3, ""), ("issima", 3, ""), ("zinho", 2, ""), ("zinha", 2, ""), ("inho", 3, ""),
+    ("inha", 3, ""),
+]
+
+_NOUN_RULES = [
+    ("amento", 3, ""), ("imento", 3, ""), ("ancia", 3, ""), ("encia", 3, ""), ("idade", 4, ""),
+    ("mento", 6, ""), ("acao", 3, ""), ("icao", 3, ""), ("ucao", 3, ""), ("ador", 3, ""),
+    ("edor", 3, ""), ("idor", 4, ""), ("ismo", 3, ""), ("ista", 4, ""), ("avel", 2, ""),
+    ("ivel", 3, ""), ("ante", 2, ""), ("ario", 3, ""), ("eza", 3, ""), ("oso", 3, ""),
+    ("ico", 4, ""), ("ivo", 4, ""), ("ura", 4, ""),
+]
+
+_VERB_RULES = [
+    ("ariam", 2, ""), ("eriam", 3, ""), ("iriam", 3, ""), ("assem", 2, ""), ("essem", 3, ""),
+    ("issem", 3, ""), ("ando", 2, ""), ("endo", 3, ""), ("indo", 3, ""), ("avam", 2, ""),
+    ("aram", 2, ""), ("eram", 3, ""), ("iram", 3, ""), ("aria", 2, ""), ("eria", 3, ""),
+    ("iria", 3, ""), ("ava", 2, ""), ("ado", 2, ""), ("ido", 3, ""), ("iam", 3, ""),
+    ("ar", 2, ""), ("er", 2, ""), ("ir", 3, ""), ("ou", 3, ""), ("am", 2, ""), ("em", 2, ""),
+    ("ia", 3, ""), ("ei", 3, ""),
+]
+
+_VOWEL_RULES = [("a", 3, ""), ("e", 3, ""), ("o", 3, "")]
+
+# Prefixos verbais tentados na consulta ("envenenar" → "venen", como em "veneno")
+_QUERY_PREFIXES = ("des", "en", "em")
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES DE NORMALIZAÇÃO
+
+def normalize_text(x: str) -> str:
+    """
+    Normaliza um texto para comparação:
+    - remove acentos (NFKD + descarte de caracteres combinantes)
+    - colapsa espaços em branco
+    - converte para minúsculas
+    """
+    if x is None:
+        return ""
+
+    x = str(x)
+
+    x = unicodedata.normalize("NFKD", x)
+    x = "".join(c for c in x if not unicodedata.combining(c))
+    x = _WHITESPACE_RE.sub(" ", x).strip().lower()
+
+    return x
+
+@lru_cache(maxsize=None)
+def _combining_table() -> dict:
+    """
+    Tabela de `str.translate` que remove todos os caracteres combinantes (acentos após o NFKD).
+    Construída uma única vez por processo.
+    """
+    return {cp: None for cp in range(sys.maxunicode + 1) if unicodedata.combining(chr(cp))}
+
+def normalize_series(s: pd.Series) -> pd.Series:
+    r"""
+    Versão vetorizada de `normalize_text` para uma coluna inteira.
+
+    Produz o mesmo resultado de `normalize_text` para cada texto, mas normaliza cada valor
+    distinto uma única vez (`pd.factorize`) usando apenas operações `.str` do pandas.
+    `split()` + `join(" ")` equivale a colapsar `\s+` e aplicar `strip()`.
+    Nas abas com tiers o mesmo nome se repete em várias linhas, então o ganho é proporcional.
+
+    Diferença: todo valor nulo (None, NaN, NaT) vira texto vazio, enquanto `normalize_text(nan)`
+    (e o antigo `astype(str)`) dava "nan"; assim células vazias não casam com a busca "nan".
+    """
+    codes, uniques = pd.factorize(s.fillna("").astype(str))
+
+    normalized = (
+        pd.Series(uniques, dtype=object)
+        .str.normalize("NFKD")
+        .str.translate(_combining_table())
+        .str.split()
+        .str.join(" ")
+        .str.lower()
+    )
+
+    return pd.Series(normalized.to_numpy(dtype=object)[codes], index=s.index, name=s.name, dtype=object)
+
+def tokenize(x: str, stopwords: frozenset = PORTUGUESE_STOPWORDS, normalized: bool = False) -> list:
+    """
+    Quebra um texto em termos normalizados (sem acentos, minúsculos), descartando stopwords.
+    Use `normalized=True` quando o texto já passou por `normalize_text`/`normalize_series`.
+    """
+    if not normalized:
+        x = normalize_text(x)
+
+    return [t for t in _TOKEN_RE.findall(x) if t not in stopwords]
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES DE STEMMING
+
+def _apply_rules(word: str, rules: list):
+    """ Aplica a primeira regra cujo sufixo casa e respeita o radical mínimo; (palavra, aplicou). """
+    for suffix, min_stem, replacement in rules:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            return word[:len(word) - len(suffix)] + replacement, True
+    return word, False
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Stemmer leve do português, no estilo do RSLP, para palavras já normalizadas (sem acentos):
+    plural → feminino → aumentativo/diminutivo → sufixo nominal → (se nenhum) sufixo verbal →
+    (se nenhum) vogal final. Ex.: "pocoes" e "pocao" → "poca"; "venenos" e "veneno" → "venen".
+    """
+    if len(word) < 3:
+        return word
+
+    if word.endswith("s"):
+        word, _ = _apply_rules(word, _PLURAL_RULES)
+
+    if word.endswith("a"):
+        word, _ = _apply_rules(word, _FEMININE_RULES)
+
+    word, _ = _apply_rules(word, _AUGMENTATIVE_RULES)
+    word, applied = _apply_rules(word, _NOUN_RULES)
+
+    if not applied:
+        word, applied = _apply_rules(word, _VERB_RULES)
+
+    if not applied:
+        word, _ = _apply_rules(word, _VOWEL_RULES)
+
+    return word
+
+def stem_tokens(tokens: list) -> list:
+    """ Radicais de uma lista de termos (usado na construção dos índices). """
+    return [stem(t) for t in tokens]
+
+def query_stems(token: str) -> list:
+    """
+    Radicais a procurar para um termo da consulta: o radical do termo e, se ele começar por um
+    prefixo verbal comum (des-, en-, em-), também o radical sem o prefixo.
+    """
+    root = stem(token)
+    stems = [root]
+
+    for prefix in _QUERY_PREFIXES:
+        if root.startswith(prefix) and len(root) - len(prefix) >= 3:
+            stems.append(root[len(prefix):])
+
+    return stems
@@ -0,0 +1,70 @@
+"""
+Script que contém o agrupamento (pré-calculado por aba) das linhas de cada item por tier,
+usado nas fichas com tiers (armas, armaduras, escudos, consumíveis).
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import numpy as np
+import pandas as pd
+
+# RELATIVE IMPORTS
+from app.src.index_cache import get_sheet_index
+
+# ------------------------------------------------------------------------------------------------ #
+# CLASSES
+
+class TierGroups:
+    """
+    Mapeamento nome do item → {nível do tier: posição da linha na aba}, calculado com um único
+    `groupby(...).indices` sobre a aba (uma vez por versão dos dados). Com ele cada ficha acha
+    as suas linhas em O(1), sem máscaras `df[df[nome] == item]` sobre a tabela inteira.
+
+    `tier_names` são os pares (nível, nome do tier) do conjunto de nomes usado na página;
+    tiers com nome desconhecido ficam de fora. Se um item repetir um tier, vale a primeira
+    linha da aba.
+    """
+
+    def __init__(self, df: pd.DataFrame, name_column: str, tier_column: str, tier_names: tuple):
+        self.labels = df.index
+        self.n_rows = len(df)
+
+        name_to_level = {name: level for level, name in tier_names}
+        levels = df[tier_column].astype(str).str.strip().map(name_to_level).to_numpy(dtype=float)
+
+        self.tiers = {}
+
+        for item_name, positions in df.groupby(name_column, sort=False).indices.items():
+            item_tiers = {}
+
+            for position, level in zip(positions.tolist(), levels[positions].tolist()):
+                if not np.isnan(level):
+                    item_tiers.setdefault(int(level), position)
+
+            self.tiers[item_name] = item_tiers
+
+    def frame_positions(self, df: pd.DataFrame) -> np.ndarray:
+        """ Posição em `df` de cada linha da aba (-1 = fora de `df`). """
+        sheet_positions = pd.Index(self.labels).get_indexer(df.index)
+        found = sheet_positions >= 0
+
+        frame_positions = np.full(self.n_rows, -1, dtype=np.int64)
+        frame_positions[sheet_positions[found]] = np.flatnonzero(found)
+
+        return frame_positions
+
+    def item_positions(self, item_name, frame_positions: np.ndarray) -> dict:
+        """ {nível do tier: posição em `df`} do item, só com as linhas presentes em `df`. """
+        return {
+            level: int(frame_positions[position])
+            for level, position in sorted(self.tiers.get(item_name, {}).items())
+            if frame_positions[position] >= 0
+        }
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def get_tier_groups(df: pd.DataFrame, name_column: str, tier_column: str, tier_map: dict) -> TierGroups:
+    """ Agrupamento por item/tier da aba de `df`, em cache por versão dos dados. """
+    return get_sheet_index(df, "tiers", TierGroups, name_column, tier_column, tuple(sorted(tier_map.items())))
@@ -24,6 +24,8 @@ sys.path.append(app_directory)
 
 pages_folder = get_project_folder("pages")
 
+from app.components.global_search import global_search
+
 # ------------------------------------------------------------------------------------------------ #
 # PAGES
 
@@ -70,6 +72,16 @@ calendar = st.Page(os.path.join(pages_folder, "yrth", "calendar.py"),
 # ------------------------------------------------------------------------------------------------ #
 # NAVIGATION
 
+# Página de cada catálogo da busca global
+catalog_pages = {
+    "grimory.xlsx": grimory,
+    "skills.xlsx": skills,
+    "weapons_with_tiers.xlsx": weapons,
+    "armors.xlsx": armors,
+    "alchemy.xlsx": alchemy,
+    "advantages_and_disadvantages.xlsx": adv_dis,
+}
+
 pg = st.navigation(
     pages =
     {
@@ -83,4 +95,10 @@ pg = st.navigation(
     expanded=False
 )
 
+# ------------------------------------------------------------------------------------------------ #
+# BUSCA GLOBAL
+
+with st.sidebar:
+    global_search(catalog_pages)
+
 pg.run()
\ No newline at end of file
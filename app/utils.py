@@ -60,6 +60,30 @@ TIER_NAME_SETS = {
 
 }
 
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES DO GLOSSÁRIO
+
+# Siglas de regras destacadas nas descrições (sempre em maiúsculas, palavra inteira)
+GLOSSARY_TERMS = {
+    "ST": "Força",
+    "DX": "Destreza",
+    "IQ": "Inteligência",
+    "HT": "Vitalidade",
+    "NH": "Nível de Habilidade",
+    "GDP": "Golpe de Ponta (dano de estocada baseado na ST)",
+    "BAL": "Golpe em Balanço (dano de golpe baseado na ST)",
+    "RD": "Resistência a Dano",
+    "DR": "Resistência a Dano",
+    "PD": "Defesa Passiva",
+    "PV": "Pontos de Vida",
+    "HP": "Pontos de Vida",
+    "NT": "Nível Tecnológico",
+    "GM": "Mestre do Jogo",
+}
+
+# Perícias do catálogo (skills.xlsx) também entram no glossário, com este texto de dica
+GLOSSARY_SKILL_TITLE = "Perícia · {category} · {type}/{difficulty}"
+
 def tier_name_to_level(name, tier_set):
     mapping = TIER_NAME_SETS[tier_set]
     for level, n in mapping.items():
@@ -0,0 +1,89 @@
+"""
+Benchmark da normalização de texto das colunas de busca.
+
+Compara, em abas sintéticas de 100 mil linhas, a normalização linha a linha
+(`.apply(normalize_text)`) com a versão vetorizada (`normalize_series`) e mostra o custo
+de reaproveitar o índice de nomes já materializado para a versão dos dados.
+
+São medidos dois cenários: nomes quase todos distintos e nomes repetidos por tier
+(5 linhas por item, como em weapons_with_tiers.xlsx).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_normalization
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import random
+import pandas as pd
+
+from benchmarks.common import measure, print_table
+from app.src.text_processing import normalize_text, normalize_series, _combining_table
+from app.src.search_index import NameIndex
+from app.src.index_cache import VersionedIndexCache
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+N_ROWS = 100_000
+
+WORDS = [
+    "Espada", "Longa", "Poção", "de", "Cura", "Lança", "Machado", "Escudo", "Pesado",
+    "Elixir", "Veneno", "Água", "Fogo", "Trovão", "Círculo", "Proteção", "Ação", "Ígneo",
+    "Ímpeto", "Éter", "Névoa", "Coração", "Dragão", "Sombrio", "Bênção", "Mão", "Açoite",
+]
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def make_synthetic_sheet(n_rows: int = N_ROWS, rows_per_name: int = 1, seed: int = 42) -> pd.DataFrame:
+    """ Aba sintética com nomes acentuados, espaços irregulares e alguns nulos. """
+    rng = random.Random(seed)
+    names = []
+
+    while len(names) < n_rows:
+        words = rng.choices(WORDS, k=rng.randint(1, 6))
+        sep = rng.choice([" ", "  ", "\t", " \n "])
+        name = sep.join(words) if rng.random() > 0.01 else None
+        names.extend([name] * rows_per_name)
+
+    return pd.DataFrame({"item_id": range(n_rows), "item_name": names[:n_rows]})
+
+def bench_scenario(label: str, df: pd.DataFrame) -> None:
+    column = df["item_name"]
+
+    rowwise = measure(lambda: column.fillna("").astype(str).apply(normalize_text))
+    vectorized = measure(lambda: normalize_series(column))
+
+    assert rowwise["result"].equals(vectorized["result"]), "normalizações divergentes"
+
+    cache = VersionedIndexCache()
+    build = lambda: cache.get_or_build(("names", label, "item_name"), "v1", lambda: NameIndex(df, "item_name"))
+    first = measure(build, repeat=1)
+    reuse = measure(build)
+
+    unique_ratio = column.nunique(dropna=False) / len(column)
+    print(f"\n{label}: {len(df):,} linhas, {unique_ratio:.0%} de valores distintos\n")
+    print_table(
+        [
+            {"etapa": "apply(normalize_text)", **rowwise},
+            {"etapa": "normalize_series", **vectorized},
+            {"etapa": "NameIndex: 1ª construção", **first},
+            {"etapa": "NameIndex: mesma versão (cache)", **reuse},
+        ],
+        ["etapa", "min_ms", "p50_ms", "p95_ms"],
+    )
+    print(f"Ganho da versão vetorizada (p50): {rowwise['p50_ms'] / vectorized['p50_ms']:.1f}x")
+
+def main():
+    # A tabela de caracteres combinantes é construída uma vez por processo
+    table = measure(lambda: _combining_table(), repeat=1)
+    print(f"Tabela de caracteres combinantes (1x por processo): {table['min_ms']:.1f} ms")
+
+    bench_scenario("Nomes distintos", make_synthetic_sheet())
+    bench_scenario("Nomes por tier (5x)", make_synthetic_sheet(rows_per_name=5))
+
+# ------------------------------------------------------------------------------------------------ #
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Benchmark de latência, memória e qualidade (recall/precisão) da busca por nome.
+
+Carrega as abas reais (skills, arquétipos do grimório, melee e potions), replica cada uma
+sinteticamente em 10x e 100x e executa um log fixo de consultas (prefixos, erros de digitação e
+variações de acento/maiúsculas) em cada motor de busca registrado em `ENGINES`:
+
+- search_box: a lógica de casamento atual do `search_box` (substring + radical + SymSpell);
+- sequence_matcher: o caminho antigo (substring + SequenceMatcher em todas as linhas);
+- field_index: o índice ponderado (`WeightedFieldIndex`) apenas sobre a coluna de nome.
+
+Para cada (aba, escala, motor) são medidos: tempo e memória da construção do índice
+(`tracemalloc`: memória retida e pico), latência p50/p95 por consulta, e recall/precisão
+(micro) contra o conjunto rotulado de cada consulta.
+
+Uso (na raiz do projeto; a escala 100x com o sequence_matcher leva alguns minutos):
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --scales 1 10 --engines search_box field_index
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import argparse
+import random
+import tracemalloc
+import warnings
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import measure, print_table
+from benchmarks.bench_symspell import add_typos, sequence_matcher_match
+from app.src.data_loader import read_excel_data
+from app.src.fulltext_index import WeightedFieldIndex
+from app.src.search_index import NameIndex, SymSpellIndex
+from app.src.text_processing import normalize_text, normalize_series
+
+warnings.simplefilter(action="ignore", category=UserWarning)
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+# nome: (arquivo, abas (None = todas), coluna de nome)
+DATASETS = {
+    "skills": ("skills.xlsx", ["skills"], "skill_name"),
+    "grimory": ("grimory.xlsx", None, "spell_name"),
+    "melee": ("weapons_with_tiers.xlsx", ["melee"], "weapon_name"),
+    "potions": ("alchemy.xlsx", ["potions"], "consumable_name"),
+}
+
+SCALES = [1, 10, 100]
+N_QUERIES = 60
+QUERY_KINDS = ["prefix", "typo", "accent"]
+
+# ------------------------------------------------------------------------------------------------ #
+# MOTORES DE BUSCA
+
+def _engine_search_box(df: pd.DataFrame, column: str):
+    speller = SymSpellIndex(NameIndex(df, column))
+    return lambda query: speller.match(normalize_text(query))[0]
+
+def _engine_sequence_matcher(df: pd.DataFrame, column: str):
+    names = NameIndex(df, column)
+    return lambda query: sequence_matcher_match(names, normalize_text(query))[0]
+
+def _engine_field_index(df: pd.DataFrame, column: str):
+    index = WeightedFieldIndex(df, {column: 1})
+    return lambda query: index.search(query)[0]
+
+# motor: função (df, coluna) → busca(query) → posições encontradas
+ENGINES = {
+    "search_box": _engine_search_box,
+    "sequence_matcher": _engine_sequence_matcher,
+    "field_index": _engine_field_index,
+}
+
+# ------------------------------------------------------------------------------------------------ #
+# DADOS E LOG DE CONSULTAS
+
+def load_dataset(name: str) -> pd.DataFrame:
+    """ Aba(s) real(is) com a coluna de nome e `base_name` (rótulo usado no recall). """
+    file_name, sheets, column = DATASETS[name]
+    df_dict = read_excel_data(file_name) or {}
+
+    frames = [
+        df[[column]] for sheet, df in df_dict.items()
+        if (sheets is None or sheet in sheets) and column in df.columns
+    ]
+
+    df = pd.concat(frames, ignore_index=True).dropna()
+    df[column] = df[column].astype(str).str.strip()
+    df["base_name"] = df[column]
+
+    return df
+
+def scale_dataset(df: pd.DataFrame, column: str, factor: int) -> pd.DataFrame:
+    """ Replica a aba `factor` vezes; as cópias ganham um sufixo numérico no nome. """
+    copies = [df]
+
+    for k in range(1, factor):
+        copy = df.copy()
+        copy[column] = copy[column] + f" {k}"
+        copies.append(copy)
+
+    return pd.concat(copies, ignore_index=True)
+
+def _accent_variant(name: str, rng: random.Random) -> str:
+    """ Variação de digitação: sem acentos e com maiúsculas trocadas. """
+    plain = normalize_text(name)
+    return plain.upper() if rng.random() < 0.5 else plain.title()
+
+def make_query_log(df: pd.DataFrame, n_queries: int = N_QUERIES, seed: int = 7) -> list:
+    """
+    Log fixo de consultas (termo, tipo, nomes-base relevantes) sobre a aba original.
+
+    - prefix: começo da primeira palavra do nome; relevantes são os nomes com alguma palavra
+      começando pelo prefixo;
+    - typo: o nome com um erro de digitação; relevante é o próprio nome;
+    - accent: o nome sem acentos e com outras maiúsculas; relevante é o próprio nome.
+    """
+    rng = random.Random(seed)
+
+    base_names = sorted(set(df["base_name"]))
+    norms = dict(zip(base_names, normalize_series(pd.Series(base_names))))
+
+    sample = rng.sample(base_names, min(n_queries, len(base_names)))
+    queries = []
+
+    for i, name in enumerate(sample):
+        kind = QUERY_KINDS[i % len(QUERY_KINDS)]
+        norm = norms[name]
+
+        if kind == "prefix":
+            word = norm.split()[0]
+            query = word[:max(3, len(word) // 2)]
+            relevant = {
+                n for n, nn in norms.items()
+                if any(w.startswith(query) for w in nn.split())
+            }
+        elif kind == "typo":
+            query = add_typos(norm, 1, rng)
+            relevant = {name}
+        else:
+            query = _accent_variant(name, rng)
+            relevant = {name}
+
+        queries.append((query, kind, relevant))
+
+    return queries
+
+# ------------------------------------------------------------------------------------------------ #
+# EXECUÇÃO
+
+def build_engine(engine: str, df: pd.DataFrame, column: str) -> dict:
+    """
+    Constrói o motor medindo o tempo e, em uma segunda construção (o `tracemalloc` deixa a
+    execução mais lenta), a memória retida e o pico.
+    """
+    timing = measure(lambda: ENGINES[engine](df, column), repeat=1)
+
+    tracemalloc.start()
+    search = ENGINES[engine](df, column)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del search
+
+    return {
+        "search": timing["result"],
+        "build_ms": timing["min_ms"],
+        "mem_kb": retained / 1024,
+        "peak_kb": peak / 1024,
+    }
+
+def run_engine(search, df: pd.DataFrame, queries: list, repeat: int) -> dict:
+    """ Executa o log de consultas; retorna latências e recall/precisão (micro). """
+    base_names = df["base_name"].to_numpy()
+    timings = []
+    hits = retrieved = relevant_total = 0
+
+    for query, _, relevant in queries:
+        timing = measure(lambda: search(query), repeat=repeat)
+        timings.append(timing["min_ms"])
+
+        found = base_names[timing["result"]]
+        is_relevant = np.isin(base_names, list(relevant))
+
+        hits += int(np.isin(found, list(relevant)).sum())
+        retrieved += len(found)
+        relevant_total += int(is_relevant.sum())
+
+    timings = np.asarray(timings)
+
+    return {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "recall": hits / relevant_total if relevant_total else 0.0,
+        "precision": hits / retrieved if retrieved else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", nargs="+", default=list(DATASETS), choices=list(DATASETS))
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES)
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--queries", type=int, default=N_QUERIES)
+    args = parser.parse_args()
+
+    rows = []
+
+    for dataset in args.datasets:
+        column = DATASETS[dataset][2]
+        base = load_dataset(dataset)
+        queries = make_query_log(base, args.queries)
+
+        for factor in args.scales:
+            df = scale_dataset(base, column, factor)
+
+            for engine in args.engines:
+                built = build_engine(engine, df, column)
+                result = run_engine(built["search"], df, queries, repeat=3 if factor < 100 else 1)
+
+                rows.append({
+                    "aba": dataset,
+                    "escala": f"{factor}x",
+                    "linhas": len(df),
+                    "motor": engine,
+                    "build_ms": built["build_ms"],
+                    "mem_kb": built["mem_kb"],
+                    "peak_kb": built["peak_kb"],
+                    **result,
+                })
+
+    print(f"\n{args.queries} consultas por aba ({', '.join(QUERY_KINDS)})\n")
+    print_table(
+        rows,
+        ["aba", "escala", "linhas", "motor", "build_ms", "mem_kb", "peak_kb",
+         "p50_ms", "p95_ms", "recall", "precision"],
+    )
+
+# ------------------------------------------------------------------------------------------------ #
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark da busca tolerante a erros de digitação do `search_box`.
+
+Compara, nas abas reais de grimory.xlsx e skills.xlsx, o caminho antigo (substring +
+SequenceMatcher contra todas as linhas) com o dicionário de deleções (`SymSpellIndex`).
+
+O log de consultas é gerado a partir dos próprios nomes de cada aba: prefixos e versões com
+um ou dois erros (remoção, troca, inserção ou transposição de letras). Para cada consulta com
+erro, o nome original deveria aparecer no resultado; a taxa de acerto é mostrada ao lado das
+latências.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_symspell
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import random
+import string
+import warnings
+from difflib import SequenceMatcher
+import numpy as np
+
+from benchmarks.common import measure, print_table
+from app.src.data_loader import read_excel_data
+from app.src.search_index import NameIndex, SymSpellIndex
+
+warnings.simplefilter(action="ignore", category=UserWarning)
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+SHEETS = {
+    "grimory.xlsx": "spell_name",
+    "skills.xlsx": "skill_name",
+}
+
+FUZZY_THRESHOLD = 0.6
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def sequence_matcher_match(index: NameIndex, query_norm: str, fuzzy_threshold: float = FUZZY_THRESHOLD):
+    """ Caminho antigo do `search_box`: substring + SequenceMatcher em todas as linhas. """
+    norms = index.norms
+
+    mask_sub = np.fromiter((query_norm in n for n in norms), dtype=bool, count=len(norms))
+    scores = np.fromiter(
+        (SequenceMatcher(None, query_norm, n).ratio() for n in norms), dtype=np.float64, count=len(norms)
+    )
+
+    positions = np.flatnonzero(mask_sub | (scores >= fuzzy_threshold))
+    order = np.argsort(-scores[positions], kind="stable")
+    return positions[order], scores[positions[order]]
+
+def add_typos(word: str, n_typos: int, rng: random.Random) -> str:
+    """ Aplica `n_typos` erros aleatórios (remoção, troca, inserção ou transposição). """
+    for _ in range(n_typos):
+        if len(word) < 2:
+            break
+
+        i = rng.randrange(len(word) - 1)
+        kind = rng.choice(["delete", "replace", "insert", "transpose"])
+
+        if kind == "delete":
+            word = word[:i] + word[i + 1:]
+        elif kind == "replace":
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+        elif kind == "insert":
+            word = word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+        else:
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+    return word
+
+def make_query_log(index: NameIndex, seed: int = 42) -> list:
+    """ Consultas (termo, nome esperado ou None) geradas a partir dos nomes da aba. """
+    rng = random.Random(seed)
+    queries = []
+
+    for norm in dict.fromkeys(n for n in index.norms if n):
+        queries.append((norm[:max(3, len(norm) // 2)], None))
+
+        # 1 erro a partir de 5 letras, 2 erros a partir de 7 (o termo com erro pode perder uma
+        # letra e ainda precisa caber no orçamento do SymSpellIndex)
+        if len(norm) >= 5:
+            queries.append((add_typos(norm, 1, rng), norm))
+        if len(norm) >= 7:
+            queries.append((add_typos(norm, 2, rng), norm))
+
+    return queries
+
+def run_queries(match, index: NameIndex, queries: list) -> dict:
+    """ Executa o log de consultas e retorna latências por consulta e taxa de acerto. """
+    timings = []
+    found = expected = 0
+
+    for query, target in queries:
+        timing = measure(lambda: match(query), repeat=3)
+        timings.append(timing["min_ms"])
+
+        if target is not None:
+            expected += 1
+            found += target in set(index.norms[timing["result"][0]])
+
+    return {"timings": timings, "found": found, "expected": expected}
+
+def bench_file(file_name: str, column: str) -> list:
+    rows = []
+    totals = {"SequenceMatcher": [], "SymSpell": []}
+    recall = {"SequenceMatcher": [0, 0], "SymSpell": [0, 0]}
+    build_ms = 0.0
+    n_rows = n_queries = 0
+
+    for sheet_name, df in (read_excel_data(file_name) or {}).items():
+        if column not in df.columns:
+            continue
+
+        index = NameIndex(df, column)
+        build = measure(lambda: SymSpellIndex(index), repeat=3)
+        speller = build["result"]
+        build_ms += build["min_ms"]
+
+        queries = make_query_log(index)
+        n_rows += len(index)
+        n_queries += len(queries)
+
+        for name, match in (
+            ("SequenceMatcher", lambda q: sequence_matcher_match(index, q)),
+            ("SymSpell", lambda q: speller.match(q)),
+        ):
+            run = run_queries(match, index, queries)
+            totals[name].extend(run["timings"])
+            recall[name][0] += run["found"]
+            recall[name][1] += run["expected"]
+
+    for name, timings in totals.items():
+        timings = np.asarray(timings)
+        found, expected = recall[name]
+        rows.append({
+            "caminho": name,
+            "p50_ms": float(np.percentile(timings, 50)),
+            "p95_ms": float(np.percentile(timings, 95)),
+            "max_ms": float(timings.max()),
+            "acerto_com_erro": f"{found}/{expected}",
+        })
+
+    print(f"\n{file_name} ({column}): {n_rows} linhas, {n_queries} consultas")
+    print(f"Construção dos dicionários SymSpell (todas as abas, 1x por versão): {build_ms:.1f} ms\n")
+    print_table(rows, ["caminho", "p50_ms", "p95_ms", "max_ms", "acerto_com_erro"])
+    print(f"Ganho do SymSpell (p50): {rows[0]['p50_ms'] / rows[1]['p50_ms']:.1f}x")
+
+    return rows
+
+def main():
+    for file_name, column in SHEETS.items():
+        bench_file(file_name, column)
+
+# ------------------------------------------------------------------------------------------------ #
+if __name__ == "__main__":
+    main()
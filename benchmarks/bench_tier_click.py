@@ -0,0 +1,156 @@
+"""
+Benchmark da latência de um clique no seletor de tier das fichas de itens.
+
+Antes, cada ficha fazia parte do script da página: clicar em um tier reexecutava a página
+inteira (todas as fichas). Agora cada ficha é um `st.fragment` (`tiered_card`) e o clique
+reexecuta apenas a ficha dona do controle.
+
+Com o catálogo de armas corpo-a-corpo replicado até `--items` itens (cada um com os seus
+tiers), o benchmark mede no `AppTest` do Streamlit (que sempre executa o script inteiro):
+
+- página: o script com todas as fichas (`render_tiered_cards`), isto é, o custo de um clique
+  quando a página inteira era reexecutada (e o custo de abrir a página, hoje);
+- fragmento: o script com uma única ficha (`tiered_card`), que é o que um clique reexecuta
+  agora (o tempo inclui o custo fixo de uma execução do `AppTest`).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_tier_click
+    python -m benchmarks.bench_tier_click --items 100 200 400 --repeat 5
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import argparse
+import warnings
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.common import measure, print_table
+from app.src.data_loader import read_excel_data
+
+warnings.simplefilter(action="ignore", category=UserWarning)
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+ITEMS = [100, 200, 400]
+
+# ------------------------------------------------------------------------------------------------ #
+# DADOS
+
+def load_catalog(n_items: int) -> pd.DataFrame:
+    """ Armas corpo-a-corpo replicadas até `n_items` itens; as cópias ganham um sufixo no nome. """
+    base = read_excel_data("weapons_with_tiers.xlsx")["melee"]
+    n_names = base["weapon_name"].nunique()
+    copies = []
+
+    for k in range(-(-n_items // n_names)):
+        copy = base.copy()
+        copy["weapon_name"] = copy["weapon_name"] + (f" {k}" if k else "")
+        copy["weapon_id"] = copy["weapon_id"].astype(str) + f".{k:04d}"
+        copies.append(copy)
+
+    df = pd.concat(copies, ignore_index=True)
+    keep = df["weapon_name"].drop_duplicates().iloc[:n_items]
+
+    return df[df["weapon_name"].isin(keep)].reset_index(drop=True)
+
+# ------------------------------------------------------------------------------------------------ #
+# SCRIPTS DO APPTEST
+
+def _use_radio():
+    """ O `AppTest` não consegue reenviar o estado do `st.segmented_control`: usa o fallback (rádio). """
+    import streamlit as st
+
+    def segmented_control(*args, **kwargs):
+        raise RuntimeError("segmented_control indisponível no AppTest")
+
+    st.segmented_control = segmented_control
+
+def _page_script(df):
+    from app.components.cards import add_tier_levels, render_tiered_cards
+    from app.utils import TIER_NAME_SETS
+    from benchmarks.bench_tier_click import _use_radio, bench_card
+
+    _use_radio()
+
+    tier_map = TIER_NAME_SETS["qualidade"]
+    df = add_tier_levels(df.fillna(""), "weapon_tier", tier_map)
+    render_tiered_cards(df, "weapon_name", "weapon_id", "weapon_tier", tier_map, bench_card)
+
+def _card_script(df):
+    import streamlit as st
+    from app.components.cards import add_tier_levels, item_tier_rows, tiered_card
+    from app.src.tier_index import get_tier_groups
+    from app.utils import TIER_NAME_SETS
+    from benchmarks.bench_tier_click import _use_radio, bench_card
+
+    _use_radio()
+
+    tier_map = TIER_NAME_SETS["qualidade"]
+    df = add_tier_levels(df.fillna(""), "weapon_tier", tier_map)
+    name = df["weapon_name"].iloc[0]
+
+    groups = get_tier_groups(df, "weapon_name", "weapon_tier", tier_map)
+    tier_rows = item_tier_rows(df, groups.item_positions(name, groups.frame_positions(df)))
+
+    with st.expander(name):
+        tiered_card(tier_rows, name, tier_map, bench_card)
+
+def bench_card(h, tier: str) -> dict:
+    """ Mesmos campos da ficha de armas corpo-a-corpo da página. """
+    return {
+        "header": [("Tier", tier), ("Perícia", h("weapon_skill"))],
+        "fields": [
+            ("Modificador BAL", h("weapon_bal_modifier")),
+            ("Modificador GDP", h("weapon_gdp_modifier")),
+            ("Peso", f"{h('weapon_weight')} kg"),
+            ("Comprimento", f"{h('weapon_length')} m"),
+            ("Preço", f"{h('weapon_price')} moedas"),
+            ("ST Mínima", h("weapon_min_strength")),
+            ("Tipos de Dano", h("weapon_damage_type")),
+        ],
+        "sections": [("Descrição", h("weapon_description"))],
+    }
+
+# ------------------------------------------------------------------------------------------------ #
+# EXECUÇÃO
+
+def run_script(script, df: pd.DataFrame, repeat: int) -> dict:
+    """ Executa o script no `AppTest` (a primeira execução aquece os caches) e mede as seguintes. """
+    at = AppTest.from_function(script, args=(df,), default_timeout=300)
+    at.run()
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    timing = measure(lambda: at.run(), repeat=repeat)
+
+    return {"p50_ms": timing["p50_ms"], "p95_ms": timing["p95_ms"], "elements": len(at.markdown)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", nargs="+", type=int, default=ITEMS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+
+    for n_items in args.items:
+        df = load_catalog(n_items)
+
+        for scenario, script in (("página", _page_script), ("fragmento", _card_script)):
+            rows.append({
+                "itens": n_items,
+                "linhas": len(df),
+                "reexecução": scenario,
+                **run_script(script, df, args.repeat),
+            })
+
+    print("\nLatência de um clique no tier (script reexecutado pelo clique)\n")
+    print_table(rows, ["itens", "linhas", "reexecução", "elements", "p50_ms", "p95_ms"])
+
+# ------------------------------------------------------------------------------------------------ #
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark da montagem das linhas por tier das fichas de itens com todos os itens abertos.
+
+Antes, cada ficha filtrava a tabela inteira pelo nome do item (`df[df[nome] == item]`,
+ordenava por `tier_level`) e, depois, filtrava de novo por tier: O(itens × linhas) para a
+página. Agora o agrupamento nome → {tier: posição} é feito uma vez por versão dos dados
+(`TierGroups`, um `groupby(...).indices`) e cada ficha acha as suas linhas em O(1).
+
+Com o catálogo de armas corpo-a-corpo replicado até `--rows` linhas, o benchmark mede:
+
+- máscaras: o laço antigo (máscara por item + máscara por tier da linha selecionada e da
+  anterior);
+- agrupamento: construção do `TierGroups` + busca das linhas de todos os itens;
+- busca: só as buscas (o agrupamento já em cache, como nas reexecuções da página).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_tier_groups
+    python -m benchmarks.bench_tier_groups --rows 1000 10000 50000 --repeat 5
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import argparse
+import warnings
+import pandas as pd
+
+from benchmarks.common import measure, print_table
+from benchmarks.bench_tier_click import load_catalog
+from app.components.cards import add_tier_levels, item_tier_rows
+from app.src.tier_index import TierGroups
+from app.utils import TIER_NAME_SETS
+
+warnings.simplefilter(action="ignore", category=UserWarning)
+
+# ------------------------------------------------------------------------------------------------ #
+# CONSTANTES
+
+ROWS = [1_000, 10_000, 50_000]
+
+TIER_MAP = TIER_NAME_SETS["qualidade"]
+
+# ------------------------------------------------------------------------------------------------ #
+# DADOS
+
+def load_rows(n_rows: int) -> pd.DataFrame:
+    """ Armas corpo-a-corpo replicadas até `n_rows` linhas (itens inteiros, com os seus tiers). """
+    rows_per_item = len(load_catalog(1))
+    df = load_catalog(-(-n_rows // rows_per_item)).iloc[:n_rows]
+
+    return add_tier_levels(df.fillna(""), "weapon_tier", TIER_MAP)
+
+# ------------------------------------------------------------------------------------------------ #
+# CENÁRIOS
+
+def mask_rows(df: pd.DataFrame, names) -> int:
+    """ Laço antigo: máscara por item sobre a tabela inteira e, no item, por tier. """
+    found = 0
+
+    for name in names:
+        df_item = df[df["weapon_name"] == name].sort_values("tier_level")
+        levels = sorted(int(t) for t in df_item["tier_level"].dropna().unique())
+
+        for level in levels[:2]:
+            found += len(df_item[df_item["tier_level"] == level].iloc[:1])
+
+    return found
+
+def group_rows(df: pd.DataFrame, names, groups: TierGroups = None) -> int:
+    """ Agrupamento (construído aqui se `groups` não vier pronto) + busca O(1) por item. """
+    if groups is None:
+        groups = TierGroups(df, "weapon_name", "weapon_tier", tuple(sorted(TIER_MAP.items())))
+
+    frame_positions = groups.frame_positions(df)
+    found = 0
+
+    for name in names:
+        tier_rows = item_tier_rows(df, groups.item_positions(name, frame_positions))
+        levels = sorted(tier_rows)
+
+        for level in levels[:2]:
+            found += tier_rows[level] is not None
+
+    return found
+
+# ------------------------------------------------------------------------------------------------ #
+# EXECUÇÃO
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", type=int, default=ROWS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+
+    for n_rows in args.rows:
+        df = load_rows(n_rows)
+        names = df["weapon_name"].unique()
+        groups = TierGroups(df, "weapon_name", "weapon_tier", tuple(sorted(TIER_MAP.items())))
+
+        scenarios = (
+            ("máscaras", lambda: mask_rows(df, names)),
+            ("agrupamento", lambda: group_rows(df, names)),
+            ("busca", lambda: group_rows(df, names, groups)),
+        )
+
+        for scenario, func in scenarios:
+            timing = measure(func, repeat=args.repeat)
+
+            rows.append({
+                "linhas": len(df),
+                "itens": len(names),
+                "cenário": scenario,
+                "p50_ms": timing["p50_ms"],
+                "ms_por_1k_linhas": timing["p50_ms"] / len(df) * 1000,
+            })
+
+    print("\nLinhas por tier de todos os itens (todas as fichas abertas)\n")
+    print_table(rows, ["linhas", "itens", "cenário", "p50_ms", "ms_por_1k_linhas"])
+
+# ------------------------------------------------------------------------------------------------ #
+if __name__ == "__main__":
+    main()
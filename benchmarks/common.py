@@ -0,0 +1,60 @@
+"""
+Script que contém as utilidades compartilhadas pelos benchmarks do Archivum.
+"""
+
+# ------------------------------------------------------------------------------------------------ #
+# IMPORT
+
+import os
+import sys
+import time
+import numpy as np
+
+# ------------------------------------------------------------------------------------------------ #
+# PATH SETUP
+project_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+app_directory = os.path.join(project_directory, "app")
+
+for path in (project_directory, app_directory):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# ------------------------------------------------------------------------------------------------ #
+# FUNÇÕES
+
+def measure(func, repeat: int = 5) -> dict:
+    """
+    Executa `func()` `repeat` vezes e retorna as latências em milissegundos
+    (mínimo, p50 e p95) e o último resultado.
+    """
+    timings = []
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings = np.asarray(timings)
+
+    return {
+        "min_ms": float(timings.min()),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "result": result,
+    }
+
+def print_table(rows: list, columns: list) -> None:
+    """ Imprime uma lista de dicts como tabela de texto alinhada. """
+    widths = {c: max(len(c), *(len(_fmt(r.get(c))) for r in rows)) for c in columns}
+
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+
+    for r in rows:
+        print("  ".join(_fmt(r.get(c)).ljust(widths[c]) for c in columns))
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return "" if value is None else str(value)